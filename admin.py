@@ -189,6 +189,56 @@ class AdminCog(commands.Cog):
             )
             await interaction.response.send_message(embed=embed)
     
+    @app_commands.command(name="ai-usage", description="Show the heaviest AI token consumers")
+    @app_commands.describe(scope="Rank users in this server, or servers across the bot (owner only)",
+                           days="How many days back to count, including today")
+    @app_commands.choices(scope=[
+        app_commands.Choice(name="Users in this server", value="user"),
+        app_commands.Choice(name="Servers", value="guild")
+    ])
+    async def ai_usage(self, interaction: discord.Interaction, scope: str = "user", days: int = 1):
+        """Show top AI token consumers (admin only)"""
+        if scope == "guild":
+            if not await self.bot.is_owner(interaction.user):
+                await interaction.response.send_message("❌ Only the bot owner can compare servers.", ephemeral=True)
+                return
+        elif not interaction.guild or not await is_admin(interaction.user):
+            await interaction.response.send_message("❌ Only administrators can view AI usage.", ephemeral=True)
+            return
+        
+        days = max(1, min(days, 90))
+        since = (datetime.utcnow() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        usage = self.bot.ai_usage
+        rows = await usage.top_consumers(
+            by=scope, since=since, guild_id=interaction.guild.id if scope == "user" else None
+        )
+        
+        lines = []
+        for rank, (consumer_id, tokens, requests) in enumerate(rows, 1):
+            if scope == "guild":
+                guild = self.bot.get_guild(consumer_id)
+                name = guild.name if guild else ("Direct messages" if consumer_id == 0 else f"Server {consumer_id}")
+            else:
+                name = f"<@{consumer_id}>"
+            lines.append(f"**{rank}.** {name}: {tokens:,} tokens in {requests:,} requests")
+        
+        embed = discord.Embed(
+            title="📊 AI Usage",
+            description='\n'.join(lines) or "No AI usage recorded yet.",
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        if scope == "user":
+            quota = BotConfig.AI_GUILD_DAILY_TOKENS
+            used = usage.used_today(guild_id=interaction.guild.id)
+            embed.add_field(
+                name="This Server Today",
+                value=f"{used:,} / {quota:,} tokens" if quota else f"{used:,} tokens (no quota)",
+                inline=False
+            )
+        embed.set_footer(text=f"Last {days} day(s), UTC")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="help", description="Display help information")
     async def help_command(self, interaction: discord.Interaction):
         """Display help information"""
@@ -317,6 +367,7 @@ class AdminCog(commands.Cog):
                 "`/botinfo` - Bot information and stats\n"
                 "`/reload-config` - Reload configuration (admin)\n"
                 "`/set-status <type> <message>` - Set bot status (admin)\n"
+                "`/ai-usage [scope] [days]` - Top AI token consumers (admin)\n"
                 "`/help` - Show this help menu"
             ),
             inline=False
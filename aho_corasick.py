@@ -0,0 +1,167 @@
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set
+
+class Match(NamedTuple):
+    """A dictionary term found in scanned text, with its [start, end) span"""
+    term: str
+    start: int
+    end: int
+
+class AhoCorasick:
+    """Aho-Corasick automaton for finding many terms in one linear scan
+
+    Terms live in a trie; failure links send a mismatch to the longest
+    proper suffix that is also a trie path, and output links chain to the
+    terms ending there. add() and remove() keep the links up to date
+    themselves, so a scan never pays for a rebuild. They only touch the
+    term's trie path and the nodes whose failure chain runs through a node
+    they change, found through reverse failure links. That is usually a
+    handful of nodes; a term whose first character no other term starts
+    with walks most of the automaton once.
+    """
+
+    def __init__(self, terms=()):
+        # Node 0 is the root; nodes are indices into these lists
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._term: List[Optional[str]] = [None]
+        self._output: List[int] = [-1]  # nearest node on the failure chain that ends a term
+        self._fail_children: Dict[int, Set[int]] = {}  # nodes whose failure link points at the key
+        self._size = 0
+        for term in terms:
+            self.add(term)
+
+    def add(self, term: str) -> bool:
+        """Add a term, returning False if it was already present or empty"""
+        if not term:
+            return False
+        node = 0
+        for char in term:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = self._add_node(node, char)
+            node = child
+        if self._term[node] is not None:
+            return False
+        self._term[node] = term
+        self._size += 1
+        self._update_outputs(node)
+        return True
+
+    def remove(self, term: str) -> bool:
+        """Remove a term, returning False if it was not present
+
+        The term's trie path is kept, since other terms' failure links may run
+        through it; it simply stops producing matches.
+        """
+        node = 0
+        for char in term:
+            node = self._goto[node].get(char)
+            if node is None:
+                return False
+        if self._term[node] is None:
+            return False
+        self._term[node] = None
+        self._size -= 1
+        self._update_outputs(node)
+        return True
+
+    def _add_node(self, parent: int, char: str) -> int:
+        """Create the child of parent for char and link it and the nodes it becomes a suffix of"""
+        goto, fail = self._goto, self._fail
+        node = len(goto)
+        goto.append({})
+        fail.append(0)
+        self._term.append(None)
+        self._output.append(-1)
+
+        if parent:
+            state = fail[parent]
+            while state and char not in goto[state]:
+                state = fail[state]
+            self._set_fail(node, goto[state].get(char, 0))
+        else:
+            self._set_fail(node, 0)
+        goto[parent][char] = node
+
+        # Nodes whose failure chain reaches parent without meeting another
+        # char child now fail, through char, to the new node
+        stack = list(self._fail_children.get(parent, ()))
+        while stack:
+            state = stack.pop()
+            child = goto[state].get(char)
+            if child is not None:
+                if child != node:
+                    self._set_fail(child, node)
+                    self._update_outputs(child)
+                continue
+            stack.extend(self._fail_children.get(state, ()))
+        return node
+
+    def _set_fail(self, node: int, target: int):
+        """Point node's failure link at target, keeping the reverse links and its output link"""
+        children = self._fail_children.get(self._fail[node])
+        if children is not None:
+            children.discard(node)
+        self._fail[node] = target
+        self._fail_children.setdefault(target, set()).add(node)
+        self._output[node] = target if self._term[target] is not None else self._output[target]
+
+    def _update_outputs(self, node: int):
+        """Refresh the output links of the nodes whose failure chain runs through node"""
+        term, output = self._term, self._output
+        stack = [node]
+        while stack:
+            state = stack.pop()
+            nearest = state if term[state] is not None else output[state]
+            for child in self._fail_children.get(state, ()):
+                output[child] = nearest
+                # A term below state shields the rest of its chain
+                if term[child] is None:
+                    stack.append(child)
+
+    def finditer(self, text: str) -> Iterator[Match]:
+        """Yield every occurrence of every term in text, in order of end position"""
+        goto, fail, term, output = self._goto, self._fail, self._term, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            node = state if term[state] is not None else output[state]
+            while node > 0:
+                found = term[node]
+                yield Match(found, index + 1 - len(found), index + 1)
+                node = output[node]
+
+    def search(self, text: str) -> Optional[Match]:
+        """First occurrence of any term in text (the one that ends earliest), or None"""
+        if not self._size:
+            return None
+        # Same walk as finditer, kept inline since this is the per-message hot path
+        goto, fail, term, output = self._goto, self._fail, self._term, self._output
+        state = 0
+        for index, char in enumerate(text):
+            child = goto[state].get(char)
+            while child is None and state:
+                state = fail[state]
+                child = goto[state].get(char)
+            if child is None:
+                continue
+            state = child
+            node = state if term[state] is not None else output[state]
+            if node > 0:
+                found = term[node]
+                return Match(found, index + 1 - len(found), index + 1)
+        return None
+
+    def __contains__(self, term: str) -> bool:
+        node = 0
+        for char in term:
+            node = self._goto[node].get(char)
+            if node is None:
+                return False
+        return self._term[node] is not None
+
+    def __len__(self) -> int:
+        return self._size
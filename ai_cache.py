@@ -0,0 +1,198 @@
+import hashlib
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class ResponseCache:
+    """Bounded AI response cache with TTL and LRU eviction"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (expires_at, response, size)
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize input so trivially different requests share a key"""
+        return ' '.join(text.split()).casefold()
+
+    @classmethod
+    def make_key(cls, mode: str, model: str, system_prompt: str, text: str) -> str:
+        """Build a cache key from the request mode, model, system prompt and input"""
+        raw = '\x1f'.join((mode, model, system_prompt, cls.normalize(text)))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None on miss or expiry"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, response, size = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def set(self, key: str, response: str):
+        """Store a response, evicting least recently used entries to stay in bounds"""
+        size = len(key) + len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl, response, size)
+        self.total_bytes += size
+
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str):
+        """Drop an entry and release its size"""
+        _, _, size = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self.total_bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Contractions folded before vectorizing, so "what's" and "what is" match
+CONTRACTIONS = {
+    "whats": "what is", "what's": "what is", "hows": "how is", "how's": "how is",
+    "whos": "who is", "who's": "who is", "wheres": "where is", "where's": "where is",
+    "whens": "when is", "when's": "when is", "whys": "why is", "why's": "why is",
+    "it's": "it is", "thats": "that is", "that's": "that is",
+    "im": "i am", "i'm": "i am", "dont": "do not", "don't": "do not",
+    "doesnt": "does not", "doesn't": "does not", "cant": "can not", "can't": "can not",
+    "u": "you", "ur": "your", "r": "are", "pls": "please", "plz": "please",
+}
+
+WORD_PATTERN = re.compile(r"[\w']+")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+class SemanticCache:
+    """Near-duplicate AI response cache
+
+    Prompts become sparse hashed vectors of word unigrams and character
+    trigrams. A lookup returns the stored response whose prompt has the
+    highest cosine similarity, if it reaches the threshold and mentions the
+    same numbers ("2+2" and "2+3" are close but not the same question). Entries are
+    namespaced (e.g. by mode and system prompt), expire after ttl seconds
+    and are evicted least recently used past max_entries.
+    """
+
+    def __init__(self, max_entries: int, threshold: float, ttl: float, dimensions: int = 1 << 18):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl = ttl
+        self.dimensions = dimensions
+        # (namespace, normalized prompt) -> (expires_at, vector, response)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[int, float], str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, drop punctuation and expand common contractions"""
+        words = WORD_PATTERN.findall(text.casefold())
+        return ' '.join(CONTRACTIONS.get(word, word.replace("'", "")) for word in words)
+
+    def _bucket(self, feature: str) -> int:
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') % self.dimensions
+
+    def vectorize(self, normalized: str) -> Dict[int, float]:
+        """Unit-length hashed feature vector of a normalized prompt"""
+        vector: Dict[int, float] = {}
+        for word in normalized.split():
+            bucket = self._bucket(f"w:{word}")
+            vector[bucket] = vector.get(bucket, 0.0) + 1.0
+        padded = f" {normalized} "
+        for i in range(len(padded) - 2):
+            bucket = self._bucket(f"c:{padded[i:i + 3]}")
+            vector[bucket] = vector.get(bucket, 0.0) + 0.5
+
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {bucket: weight / norm for bucket, weight in vector.items()} if norm else {}
+
+    @staticmethod
+    def similarity(first: Dict[int, float], second: Dict[int, float]) -> float:
+        """Cosine similarity of two unit vectors"""
+        if len(first) > len(second):
+            first, second = second, first
+        return sum(weight * second.get(bucket, 0.0) for bucket, weight in first.items())
+
+    def get(self, namespace: str, prompt: str) -> Optional[Tuple[str, float]]:
+        """Best matching (response, similarity) at or above the threshold, or None"""
+        normalized = self.normalize(prompt)
+        vector = self.vectorize(normalized)
+        numbers = NUMBER_PATTERN.findall(normalized)
+        now = time.monotonic()
+        best_key, best_score = None, self.threshold
+
+        for key, (expires_at, stored, _) in list(self._entries.items()):
+            if expires_at < now:
+                del self._entries[key]
+                continue
+            if key[0] != namespace or NUMBER_PATTERN.findall(key[1]) != numbers:
+                continue
+            score = 1.0 if key[1] == normalized else self.similarity(vector, stored)
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(best_key)
+        self.hits += 1
+        return self._entries[best_key][2], best_score
+
+    def set(self, namespace: str, prompt: str, response: str):
+        """Store a response, evicting the least recently used entries past max_entries"""
+        normalized = self.normalize(prompt)
+        vector = self.vectorize(normalized)
+        if not vector:
+            return
+        key = (namespace, normalized)
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl, vector, response)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,16 +1,41 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import asyncio
+import contextlib
+import functools
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable, List, Optional
 import json
 
 from config import BotConfig
-from utils.filters import MessageFilter
 from utils.permissions import has_permission
+from utils.openrouter import OpenRouterError
+from utils.ai_cache import ResponseCache, SemanticCache
+from utils.single_flight import SingleFlight
+from utils.ai_scheduler import AIQueueFullError
+from utils.rate_limiter import TokenBucketLimiter
+from utils.conversation_memory import ConversationMemory, estimate_tokens
+from utils.text_chunking import split_into_chunks
+from utils.ai_profiles import get_profile
+from utils.language_detection import LANGUAGE_NAMES, detect_language
+from utils.extractive_summary import extractive_summary
+from utils.channel_buffer import ChannelBuffer
+from utils.ai_requests import AIRequestCancelled
+
+# Prefixes of the notices generate_ai_response returns instead of a real answer
+AI_ERROR_PREFIXES = ("🚫", "🚦")
+
+# Interaction tokens stop accepting followups this many seconds after the interaction
+INTERACTION_TOKEN_LIFETIME = 15 * 60
+
+# Shown above answers reused from a near-identical earlier question
+SEMANTIC_HIT_MARKER = "♻️ *Answered from a similar recent question*\n\n"
+
+# Sent in place of an answer whose generation ran past its deadline
+TIMEOUT_TEXT = "⌛ The AI took too long to respond. Please try again."
 
 class AIChatCog(commands.Cog):
     """AI-powered conversation capabilities using OpenAI"""
@@ -18,20 +43,46 @@ class AIChatCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('ai_chat')
-        self.user_cooldowns: Dict[int, datetime] = {}
-        self.message_filter = MessageFilter()
-        
-    async def is_on_cooldown(self, user_id: int) -> bool:
-        """Check if user is on cooldown for AI requests"""
-        if user_id not in self.user_cooldowns:
-            return False
-        
-        time_diff = datetime.now() - self.user_cooldowns[user_id]
-        return time_diff.total_seconds() < BotConfig.AI_COOLDOWN
+        self.ai_limiter = TokenBucketLimiter(
+            rate=1 / max(BotConfig.AI_COOLDOWN, 0.001),
+            capacity=BotConfig.AI_BURST
+        )
+        self.message_filter = bot.message_filter
+        self.response_cache = ResponseCache(
+            max_entries=BotConfig.AI_CACHE_MAX_ENTRIES,
+            max_bytes=BotConfig.AI_CACHE_MAX_BYTES,
+            ttl=BotConfig.AI_CACHE_TTL
+        )
+        self.semantic_cache = SemanticCache(
+            max_entries=BotConfig.AI_SEMANTIC_MAX_ENTRIES,
+            threshold=BotConfig.AI_SEMANTIC_THRESHOLD,
+            ttl=BotConfig.AI_SEMANTIC_TTL
+        )
+        self.in_flight = SingleFlight()
+        self.translations_skipped = 0
+        self.extractive_summaries = 0
+        self.channel_buffer = ChannelBuffer(
+            max_messages=BotConfig.AI_CHANNEL_BUFFER_SIZE,
+            max_channels=BotConfig.AI_CHANNEL_BUFFER_CHANNELS,
+            idle_timeout=BotConfig.AI_CHANNEL_BUFFER_IDLE
+        )
+        self.conversations = ConversationMemory(
+            max_conversations=BotConfig.AI_MAX_CONVERSATIONS,
+            max_turns=BotConfig.AI_HISTORY_TURNS
+        )
+        
+    def cooldown_message(self, user_id: int) -> str:
+        """Build the notice shown to a rate limited user"""
+        wait = max(1, round(self.ai_limiter.retry_after(user_id)))
+        return f"⏰ Please wait {wait} seconds before your next AI request."
     
-    def set_cooldown(self, user_id: int):
-        """Set cooldown for user"""
-        self.user_cooldowns[user_id] = datetime.now()
+    async def check_ai_rate_limit(self, interaction: discord.Interaction) -> bool:
+        """Take an AI request token for the user, replying with a notice if none are left"""
+        if self.ai_limiter.try_acquire(interaction.user.id):
+            return True
+        
+        await interaction.response.send_message(self.cooldown_message(interaction.user.id), ephemeral=True)
+        return False
     
     def _clean_response(self, response: str) -> str:
         """Clean AI response from unwanted formatting characters"""
@@ -57,69 +108,327 @@ class AIChatCog(commands.Cog):
         
         return response
     
-    async def generate_ai_response(self, message: str, user_name: str) -> Optional[str]:
-        """Generate AI response using OpenRouter"""
+    async def generate_ai_response(self, message: str, user_name: str,
+                                   on_partial: Optional[Callable[[str], Awaitable[None]]] = None,
+                                   mode: str = 'chat', use_cache: bool = True,
+                                   guild_id: Optional[int] = None,
+                                   conversation_key: Optional[Hashable] = None,
+                                   channel_context: Optional[str] = None,
+                                   user_id: Optional[int] = None, follow_up: bool = False) -> Optional[str]:
+        """Generate AI response using OpenRouter
+        
+        When on_partial is given and streaming is enabled, it is awaited with the
+        cleaned text so far as tokens arrive, at most once per edit interval.
+        Responses for modes listed in AI_CACHE_MODES are served from the response
+        cache unless use_cache is False. Concurrent requests with the same mode, context
+        and normalized message share a single upstream call, which is queued fairly
+        per guild by the bot's AI scheduler. With a conversation_key, earlier turns
+        of that conversation are sent as context, trimmed to the token budget.
+        channel_context is a transcript of recent channel messages sent alongside.
+        follow_up marks a reply to an earlier answer, which depends on its history
+        and so is never answered from the semantic cache. Requests over the guild's or user's daily token quota are refused before
+        they are queued, and upstream token usage is metered per guild and user.
+        The user's name is only sent in modes whose profile addresses the user.
+        """
         try:
             # Filter inappropriate content
             if self.message_filter.contains_filtered_words(message):
                 return "I can't respond to that type of message. Let's talk about something else!"
             
+            system_prompt = BotConfig.get_ai_system_prompt()
+            
+            # Per-mode token budget, temperature and stop sequences
+            profile = get_profile(mode)
+            user_content = f"{profile.user_turn(user_name)} {message}"
+            generation = {
+                "max_tokens": profile.token_budget(message),
+                "temperature": profile.temperature,
+                "stop": profile.stop_sequences(user_name)
+            }
+            
+            # Include as much of the conversation as fits next to the reply budget
+            history = []
+            if conversation_key is not None:
+                token_budget = min(
+                    BotConfig.AI_HISTORY_TOKEN_BUDGET,
+                    BotConfig.AI_CONTEXT_WINDOW - generation["max_tokens"]
+                    - estimate_tokens(system_prompt) - estimate_tokens(user_content)
+                )
+                history = self.conversations.get_history(conversation_key, max(0, token_budget))
+            
+            context_messages = []
+            if channel_context:
+                context_messages.append({
+                    "role": "system",
+                    "content": f"Recent messages in this channel, oldest first:\n{channel_context}"
+                })
+            
+            context = system_prompt + ''.join(
+                f"\x1e{turn['role']}:{turn['content']}" for turn in context_messages + history
+            )
+            
+            # Pick a model tier by prompt size, mode and live model health
+            model = self.bot.ai_router.route(
+                mode, estimate_tokens(context) + estimate_tokens(user_content),
+                generation["max_tokens"], preferred=profile.model
+            )
+            generation["model"] = model
+            # The prompt only carries the user's name in modes that address the user,
+            # so elsewhere every user's identical request shares an answer
+            request_key = ResponseCache.make_key(mode, model, context, user_content)
+            
+            # Serve repeated deterministic requests from the cache
+            cache_key = None
+            if use_cache and mode in BotConfig.AI_CACHE_MODES:
+                cache_key = request_key
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    if conversation_key is not None:
+                        self.conversations.add_exchange(conversation_key, user_content, cached)
+                    return cached
+            
+            # Paraphrases of a recent context-free question reuse its answer. The
+            # namespace covers the user's name only in modes that address the user.
+            semantic_namespace = None
+            if use_cache and mode in BotConfig.AI_SEMANTIC_CACHE_MODES and not follow_up and not channel_context:
+                semantic_namespace = ResponseCache.make_key(
+                    mode, '', f"{system_prompt}\x1f{profile.user_turn(user_name)}", ''
+                )
+                match = self.semantic_cache.get(semantic_namespace, message)
+                if match is not None:
+                    cached, similarity = match
+                    self.logger.info(f"Semantic cache hit ({similarity:.2f}) for {mode} request")
+                    if conversation_key is not None:
+                        self.conversations.add_exchange(conversation_key, user_content, cached)
+                    return SEMANTIC_HIT_MARKER + cached
+            
             # Prepare messages for OpenRouter
             messages = [
                 {
                     "role": "system",
-                    "content": BotConfig.get_ai_system_prompt()
+                    "content": system_prompt
                 },
+                *context_messages,
+                *history,
                 {
                     "role": "user",
-                    "content": f"User {user_name} says: {message}"
+                    "content": user_content
                 }
             ]
             
-            # Call OpenRouter API
-            headers = {
-                "Authorization": f"Bearer {BotConfig.OPENROUTER_API_KEY}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": BotConfig.OPENROUTER_MODEL,
-                "messages": messages,
-                "max_tokens": BotConfig.MAX_TOKENS,
-                "temperature": 0.7
-            }
+            # Enforce daily token quotas before taking a queue slot
+            exceeded = self.bot.ai_usage.quota_exceeded(guild_id, user_id)
+            if exceeded == 'guild':
+                return "🚫 This server has used up its AI allowance for today. It resets at 00:00 UTC."
+            if exceeded == 'user':
+                return "🚫 You have used up your AI allowance for today. It resets at 00:00 UTC."
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        raw_response = data["choices"][0]["message"]["content"].strip()
-                        return self._clean_response(raw_response)
+            # Call OpenRouter through the bot's shared client (retries and model fallback included)
+            async def call_upstream() -> str:
+                usage = []
+                chunks = []
+                metered = {**generation, "on_usage": usage.append}
+                try:
+                    if on_partial and BotConfig.AI_STREAMING:
+                        text = await self._stream_completion(messages, on_partial, metered, chunks)
                     else:
-                        error_text = await response.text()
-                        self.logger.error(f"OpenRouter API error {response.status}: {error_text}")
-                        return "🚫 AI service is temporarily unavailable. Please try again later."
+                        data = await self.bot.ai_client.chat_completion(messages, **metered)
+                        text = data["choices"][0]["message"]["content"]
+                except asyncio.CancelledError:
+                    # Upstream keeps generating (and billing) after we hang up
+                    self._record_usage(guild_id, user_id, usage, messages, ''.join(chunks))
+                    raise
+                except Exception:
+                    # A stream that broke off mid-answer was billed for what it sent
+                    if chunks:
+                        self._record_usage(guild_id, user_id, usage, messages, ''.join(chunks))
+                    raise
+                # Coalesced callers share this call, so only its starter is billed
+                self._record_usage(guild_id, user_id, usage, messages, text)
+                return text
+            
+            try:
+                # Identical concurrent requests wait on the first caller's upstream call
+                raw_response = await self.in_flight.run(
+                    request_key, lambda: self.bot.ai_scheduler.submit(guild_id, call_upstream)
+                )
+            except AIQueueFullError:
+                return "🚦 The AI is handling a lot of requests right now. Please try again in a moment."
+            except OpenRouterError as e:
+                self.logger.error(str(e))
+                return "🚫 AI service is temporarily unavailable. Please try again later."
+            
+            response = self._clean_response(raw_response.strip())
+            if cache_key and response:
+                self.response_cache.set(cache_key, response)
+            # Only answers written without earlier turns are fit for other users
+            if semantic_namespace and response and not history:
+                self.semantic_cache.set(semantic_namespace, message, response)
+            if conversation_key is not None and response:
+                self.conversations.add_exchange(conversation_key, user_content, response)
+            return response
             
         except Exception as e:
             self.logger.error(f"Unexpected error in AI response: {e}")
             return "🚫 Something went wrong while generating a response."
     
+    def _record_usage(self, guild_id: Optional[int], user_id: Optional[int], usage: List[dict],
+                      messages: List[dict], response: str):
+        """Meter an upstream call, estimating tokens if OpenRouter reported no usage"""
+        if usage:
+            prompt_tokens = sum(report.get("prompt_tokens", 0) for report in usage)
+            completion_tokens = sum(report.get("completion_tokens", 0) for report in usage)
+        else:
+            prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+            completion_tokens = estimate_tokens(response)
+        self.bot.ai_usage.record(guild_id, user_id, prompt_tokens, completion_tokens)
+    
+    async def _stream_completion(self, messages, on_partial: Callable[[str], Awaitable[None]],
+                                 generation: dict, chunks: List[str]) -> str:
+        """Consume a streamed completion into chunks, pushing throttled partial updates
+        
+        chunks holds whatever has streamed so far should the call be cut short.
+        """
+        last_update = 0.0
+        
+        async for delta in self.bot.ai_client.stream_chat_completion(messages, **generation):
+            chunks.append(delta)
+            
+            # Stay under Discord's message edit rate limit
+            now = time.monotonic()
+            if now - last_update < BotConfig.AI_STREAM_EDIT_INTERVAL:
+                continue
+            
+            partial = self._clean_response(''.join(chunks))
+            if partial:
+                last_update = now
+                try:
+                    await on_partial(partial)
+                except discord.HTTPException as e:
+                    self.logger.warning(f"Failed to push streamed update: {e}")
+        
+        return ''.join(chunks)
+    
+    def _author_name(self, guild: Optional[discord.Guild], author_id: int) -> str:
+        """Display name for a user from the gateway cache, without REST calls"""
+        user = (guild.get_member(author_id) if guild else None) or self.bot.get_user(author_id)
+        return user.display_name if user else f"User {author_id}"
+    
+    def _channel_transcript(self, channel_id: int, guild: Optional[discord.Guild], limit: int,
+                            token_budget: Optional[int] = None, skip_latest: bool = False,
+                            separator: str = '\n') -> str:
+        """Recent buffered messages of a channel as "[HH:MM] name: text" lines, oldest first
+        
+        With a token_budget the oldest lines are dropped until the rest fit.
+        skip_latest leaves out the newest message (the one being answered).
+        """
+        messages = self.channel_buffer.recent(channel_id, limit + 1 if skip_latest else limit)
+        if skip_latest:
+            messages = messages[:-1]
+        
+        lines = []
+        used = 0
+        for record in reversed(messages):
+            line = (
+                f"[{datetime.fromtimestamp(record.timestamp).strftime('%H:%M')}] "
+                f"{self._author_name(guild, record.author_id)}: {record.content}"
+            )
+            cost = estimate_tokens(line)
+            if token_budget is not None and used + cost > token_budget:
+                break
+            lines.append(line)
+            used += cost
+        lines.reverse()
+        return separator.join(lines)
+    
+    async def _send_ai_embed(self, send: Callable[..., Awaitable[discord.Message]], embed: discord.Embed,
+                             prompt: str, user_name: str, failure_text: str,
+                             render: Optional[Callable[[discord.Embed, str], None]] = None,
+                             mode: str = 'chat', guild_id: Optional[int] = None,
+                             conversation_key: Optional[Hashable] = None,
+                             channel_context: Optional[str] = None, user_id: Optional[int] = None,
+                             request_key: Optional[Hashable] = None, deadline: Optional[float] = None,
+                             follow_up: bool = False):
+        """Generate a response and deliver it in an embed, streaming edits when enabled
+        
+        render places the response text into the embed; by default it becomes the description.
+        Replies in a conversation are linked so that replying to them continues it.
+        Generation is tracked under request_key (the id of whatever is being answered)
+        and cancelled at deadline, a time.monotonic() value defaulting to AI_REQUEST_TIMEOUT
+        from now, or when the request is cancelled because the answer can't be delivered.
+        """
+        if render is None:
+            def render(target: discord.Embed, text: str):
+                target.description = text[:4096]
+        
+        if deadline is None:
+            deadline = time.monotonic() + BotConfig.AI_REQUEST_TIMEOUT
+        
+        if not BotConfig.AI_STREAMING:
+            try:
+                ai_response = await self.bot.ai_requests.run(request_key, self.generate_ai_response(
+                    prompt, user_name, mode=mode, guild_id=guild_id, conversation_key=conversation_key,
+                    channel_context=channel_context, user_id=user_id, follow_up=follow_up
+                ), deadline)
+            except AIRequestCancelled as e:
+                if e.reason == 'deadline':
+                    with contextlib.suppress(discord.HTTPException):
+                        await send(content=TIMEOUT_TEXT)
+                return
+            if ai_response:
+                render(embed, ai_response)
+                reply = await send(embed=embed)
+                if conversation_key is not None:
+                    self.conversations.link_message(reply.id, conversation_key)
+            else:
+                await send(content=failure_text)
+            return
+        
+        render(embed, "💭 Thinking...")
+        reply = await send(embed=embed)
+        
+        async def update(partial: str):
+            render(embed, partial + " ▌")
+            await reply.edit(embed=embed)
+        
+        try:
+            ai_response = await self.bot.ai_requests.run(request_key, self.generate_ai_response(
+                prompt, user_name, on_partial=update, mode=mode, guild_id=guild_id,
+                conversation_key=conversation_key, channel_context=channel_context, user_id=user_id,
+                follow_up=follow_up
+            ), deadline)
+        except AIRequestCancelled as e:
+            await self._abandon_reply(reply, e.reason)
+            return
+        
+        if ai_response:
+            render(embed, ai_response)
+            await reply.edit(embed=embed)
+            if conversation_key is not None:
+                self.conversations.link_message(reply.id, conversation_key)
+        else:
+            await reply.edit(content=failure_text, embed=None)
+    
+    async def _abandon_reply(self, reply: discord.Message, reason: str):
+        """Clean up a placeholder reply whose generation was cancelled"""
+        with contextlib.suppress(discord.HTTPException):
+            if reason == 'message deleted':
+                await reply.delete()
+            elif reason == 'deadline':
+                await reply.edit(content=TIMEOUT_TEXT, embed=None)
+    
+    @staticmethod
+    def _interaction_deadline(interaction: discord.Interaction) -> float:
+        """Monotonic time after which a reply to interaction can no longer be delivered"""
+        age = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        # Leave a few seconds to send the final edit
+        remaining = INTERACTION_TOKEN_LIFETIME - age - 5
+        return time.monotonic() + min(remaining, BotConfig.AI_REQUEST_TIMEOUT)
+    
     @app_commands.command(name="chat", description="Chat with the AI assistant")
     @app_commands.describe(message="Your message to the AI")
     async def chat_command(self, interaction: discord.Interaction, message: str):
         """Slash command for AI chat"""
-        # Check cooldown
-        if await self.is_on_cooldown(interaction.user.id):
-            await interaction.response.send_message(
-                f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.",
-                ephemeral=True
-            )
-            return
-        
         # Check if AI is disabled in this channel
         if hasattr(interaction.channel, 'name') and interaction.channel.name in BotConfig.AI_DISABLED_CHANNELS:
             await interaction.response.send_message(
@@ -128,30 +437,31 @@ class AIChatCog(commands.Cog):
             )
             return
         
-        await interaction.response.defer()
-        
-        # Set cooldown
-        self.set_cooldown(interaction.user.id)
+        # Check cooldown
+        if not await self.check_ai_rate_limit(interaction):
+            return
         
-        # Generate response
-        ai_response = await self.generate_ai_response(message, interaction.user.display_name)
+        await interaction.response.defer()
         
-        if ai_response:
-            # Create embed for response
-            embed = discord.Embed(
-                description=ai_response,
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
-            )
-            embed.set_author(
-                name=f"AI Response to {interaction.user.display_name}",
-                icon_url=interaction.user.display_avatar.url
-            )
-            embed.set_footer(text="Powered by OpenAI")
-            
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("🚫 Failed to generate AI response.")
+        # Create embed for response
+        embed = discord.Embed(
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        embed.set_author(
+            name=f"AI Response to {interaction.user.display_name}",
+            icon_url=interaction.user.display_avatar.url
+        )
+        embed.set_footer(text="Powered by OpenAI")
+        
+        # Generate and send response
+        await self._send_ai_embed(
+            functools.partial(interaction.followup.send, wait=True), embed,
+            message, interaction.user.display_name, "🚫 Failed to generate AI response.",
+            guild_id=interaction.guild_id,
+            conversation_key=self.conversations.resolve_key(interaction.channel_id, interaction.user.id),
+            user_id=interaction.user.id, request_key=interaction.id, deadline=self._interaction_deadline(interaction)
+        )
     
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -160,18 +470,33 @@ class AIChatCog(commands.Cog):
         if message.author.bot:
             return
         
+        # Shared with moderation, so each message is only analyzed once
+        analysis = self.message_filter.analyze_message(message)
+        
+        # Keep recent channel history in memory for channel summaries and context,
+        # leaving out messages moderation is about to delete
+        if message.content and not analysis.filtered_match:
+            self.channel_buffer.record(
+                message.channel.id, message.id, message.author.id, message.content,
+                message.created_at.timestamp()
+            )
+        
         # Check if bot is mentioned
         if self.bot.user in message.mentions:
-            # Check cooldown
-            if await self.is_on_cooldown(message.author.id):
-                await message.reply(f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.")
-                return
-            
             # Check if AI is disabled in this channel
             if hasattr(message.channel, 'name') and message.channel.name in BotConfig.AI_DISABLED_CHANNELS:
                 await message.reply("🚫 AI chat is disabled in this channel.")
                 return
             
+            # Don't spend the user's cooldown on a message moderation removes
+            if analysis.filtered_match:
+                return
+            
+            # Check cooldown
+            if not self.ai_limiter.try_acquire(message.author.id):
+                await message.reply(self.cooldown_message(message.author.id))
+                return
+            
             # Get message content without mentions
             content = message.content
             for mention in message.mentions:
@@ -181,65 +506,98 @@ class AIChatCog(commands.Cog):
             if not content:
                 content = "Hi!"
             
-            # Set cooldown
-            self.set_cooldown(message.author.id)
+            # Continue the conversation this message replies to, if any
+            reply_to = message.reference.message_id if message.reference else None
+            conversation_key = self.conversations.resolve_key(
+                message.channel.id, message.author.id, reply_to=reply_to
+            )
             
-            async with message.channel.typing():
-                ai_response = await self.generate_ai_response(content, message.author.display_name)
+            # Create embed for response
+            embed = discord.Embed(
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            embed.set_author(
+                name=f"AI Response to {message.author.display_name}",
+                icon_url=message.author.display_avatar.url
+            )
+            embed.set_footer(text="Powered by OpenRouter")
             
-            if ai_response:
-                # Create embed for response
-                embed = discord.Embed(
-                    description=ai_response,
-                    color=discord.Color.blue(),
-                    timestamp=datetime.now()
+            channel_context = None
+            if BotConfig.AI_CHANNEL_CONTEXT_MESSAGES:
+                channel_context = self._channel_transcript(
+                    message.channel.id, message.guild, BotConfig.AI_CHANNEL_CONTEXT_MESSAGES,
+                    token_budget=BotConfig.AI_CHANNEL_CONTEXT_TOKENS, skip_latest=True
                 )
-                embed.set_author(
-                    name=f"AI Response to {message.author.display_name}",
-                    icon_url=message.author.display_avatar.url
+            
+            async with message.channel.typing():
+                await self._send_ai_embed(
+                    message.reply, embed, content, message.author.display_name,
+                    "🚫 Failed to generate AI response.", mode='mention',
+                    guild_id=message.guild.id if message.guild else None,
+                    conversation_key=conversation_key, channel_context=channel_context,
+                    user_id=message.author.id, request_key=message.id,
+                    follow_up=reply_to is not None and self.conversations.is_linked(reply_to)
                 )
-                embed.set_footer(text="Powered by OpenRouter")
-                
-                await message.reply(embed=embed)
-            else:
-                await message.reply("🚫 Failed to generate AI response.")
+    
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """Stop generating answers to messages that have been deleted, and forget them"""
+        self.bot.ai_requests.cancel(payload.message_id, 'message deleted')
+        self.channel_buffer.remove(payload.channel_id, {payload.message_id})
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        """Stop generating answers to purged messages, and forget them"""
+        for message_id in payload.message_ids:
+            self.bot.ai_requests.cancel(message_id, 'message deleted')
+        self.channel_buffer.remove(payload.channel_id, payload.message_ids)
+    
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        """Keep buffered messages in step with their edits"""
+        content = payload.data.get('content')
+        # Embed-only updates carry no content
+        if content is None:
+            return
+        if not content or self.message_filter.find_filtered_word(content):
+            self.channel_buffer.remove(payload.channel_id, {payload.message_id})
+        else:
+            self.channel_buffer.update(payload.channel_id, payload.message_id, content)
 
     @commands.command(name="ask")
     @commands.cooldown(1, BotConfig.COMMAND_COOLDOWN, commands.BucketType.user)
     async def ask_command(self, ctx, *, message: str):
         """Traditional command for AI chat"""
-        # Check cooldown
-        if await self.is_on_cooldown(ctx.author.id):
-            await ctx.send(f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.")
-            return
-        
         # Check if AI is disabled in this channel
         if hasattr(ctx.channel, 'name') and ctx.channel.name in BotConfig.AI_DISABLED_CHANNELS:
             await ctx.send("🚫 AI chat is disabled in this channel.")
             return
         
-        # Set cooldown
-        self.set_cooldown(ctx.author.id)
+        # Check cooldown
+        if not self.ai_limiter.try_acquire(ctx.author.id):
+            await ctx.send(self.cooldown_message(ctx.author.id))
+            return
         
-        async with ctx.typing():
-            ai_response = await self.generate_ai_response(message, ctx.author.display_name)
+        # Create embed for response
+        embed = discord.Embed(
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        embed.set_author(
+            name=f"AI Response to {ctx.author.display_name}",
+            icon_url=ctx.author.display_avatar.url
+        )
+        embed.set_footer(text="Powered by OpenAI")
         
-        if ai_response:
-            # Create embed for response
-            embed = discord.Embed(
-                description=ai_response,
-                color=discord.Color.blue(),
-                timestamp=datetime.now()
-            )
-            embed.set_author(
-                name=f"AI Response to {ctx.author.display_name}",
-                icon_url=ctx.author.display_avatar.url
+        async with ctx.typing():
+            await self._send_ai_embed(
+                ctx.send, embed, message, ctx.author.display_name,
+                "🚫 Failed to generate AI response.",
+                guild_id=ctx.guild.id if ctx.guild else None,
+                conversation_key=self.conversations.resolve_key(ctx.channel.id, ctx.author.id),
+                user_id=ctx.author.id, request_key=ctx.message.id
             )
-            embed.set_footer(text="Powered by OpenAI")
-            
-            await ctx.send(embed=embed)
-        else:
-            await ctx.send("🚫 Failed to generate AI response.")
     
     @app_commands.command(name="ai", description="Chat with AI")
     @app_commands.describe(prompt="Your message to the AI")
@@ -253,182 +611,381 @@ class AIChatCog(commands.Cog):
         """Ask ChatGPT command (alias for chat)"""
         await self.chat_command(interaction, question)
     
+    async def _reduce_for_summary(self, text: str, user_name: str, guild_id: Optional[int],
+                                  user_id: Optional[int] = None) -> str:
+        """Map-reduce long text down to a size that fits one summary request
+        
+        Text over AI_SUMMARY_CHUNK_CHARS is split on sentence boundaries and the
+        chunks are summarized concurrently, at most AI_SUMMARY_PARALLELISM at a
+        time. The joined partial summaries are reduced again until they fit.
+        Returns the text for the final summary, or an error notice.
+        """
+        semaphore = asyncio.Semaphore(BotConfig.AI_SUMMARY_PARALLELISM)
+        
+        async def summarize_chunk(chunk: str) -> str:
+            async with semaphore:
+                return await self.generate_ai_response(
+                    f"Please summarize this section of a longer document, keeping the key facts: {chunk}",
+                    user_name, mode='summarize', guild_id=guild_id, user_id=user_id
+                )
+        
+        while len(text) > BotConfig.AI_SUMMARY_CHUNK_CHARS:
+            chunks = split_into_chunks(text, BotConfig.AI_SUMMARY_CHUNK_CHARS)
+            partials = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks))
+            
+            for partial in partials:
+                if not partial or partial.startswith(AI_ERROR_PREFIXES):
+                    return partial or "🚫 Failed to generate summary."
+            
+            reduced = '\n'.join(partials)
+            if len(reduced) >= len(text):
+                # Summaries are not shrinking the text, stop before looping forever
+                return reduced[:BotConfig.AI_SUMMARY_CHUNK_CHARS]
+            text = reduced
+        
+        return text
+    
+    async def _send_extractive_summary(self, interaction: discord.Interaction, text: str, reason: str,
+                                       title: str = "📝 Text Summary"):
+        """Answer with a local TextRank summary instead of calling the model"""
+        started = time.perf_counter()
+        # Ranking a large attachment takes long enough to stall the gateway
+        summary = await asyncio.to_thread(
+            extractive_summary, text, max_sentences=BotConfig.AI_EXTRACTIVE_SENTENCES
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        self.extractive_summaries += 1
+        self.logger.info(f"Extractive summary ({reason}) in {elapsed:.0f}ms")
+        
+        embed = discord.Embed(
+            title=title,
+            description=(summary or text)[:4096],
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"Extractive summary ({reason})")
+        await interaction.followup.send(embed=embed)
+    
+    async def _summarize_text(self, interaction: discord.Interaction, text: str, fast: bool,
+                              instruction: str, title: str = "📝 Text Summary"):
+        """Summarize text for a deferred interaction, offline when fast or when the AI can't take it"""
+        if fast:
+            await self._send_extractive_summary(interaction, text, "fast mode", title)
+            return
+        
+        # Summarize locally rather than fail while the AI is unreachable or overloaded
+        if not self.bot.ai_client.available():
+            await self._send_extractive_summary(interaction, text, "AI unavailable", title)
+            return
+        if self.bot.ai_scheduler.saturated(interaction.guild_id):
+            await self._send_extractive_summary(interaction, text, "AI busy", title)
+            return
+        
+        # Long input is summarized chunk by chunk before the final pass
+        original = text
+        deadline = self._interaction_deadline(interaction)
+        try:
+            text = await self.bot.ai_requests.run(
+                interaction.id,
+                self._reduce_for_summary(
+                    text, interaction.user.display_name, interaction.guild_id, interaction.user.id
+                ),
+                deadline
+            )
+        except AIRequestCancelled as e:
+            if e.reason == 'deadline':
+                with contextlib.suppress(discord.HTTPException):
+                    await interaction.followup.send(content=TIMEOUT_TEXT)
+            return
+        if text.startswith(AI_ERROR_PREFIXES):
+            await self._send_extractive_summary(interaction, original, "AI unavailable", title)
+            return
+        
+        summary_prompt = f"{instruction}: {text}"
+        
+        embed = discord.Embed(
+            title=title,
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Powered by OpenRouter")
+        await self._send_ai_embed(
+            functools.partial(interaction.followup.send, wait=True), embed,
+            summary_prompt, interaction.user.display_name, "🚫 Failed to generate summary.",
+            mode='summarize', guild_id=interaction.guild_id,
+            user_id=interaction.user.id, request_key=interaction.id, deadline=deadline
+        )
+    
     @app_commands.command(name="summarize", description="Summarize text")
-    @app_commands.describe(text="Text to summarize")
-    async def summarize(self, interaction: discord.Interaction, text: str):
+    @app_commands.describe(text="Text to summarize", file="Text file to summarize",
+                           fast="Instant offline summary made of key sentences")
+    async def summarize(self, interaction: discord.Interaction, text: Optional[str] = None,
+                        file: Optional[discord.Attachment] = None, fast: bool = False):
         """Summarize text using AI"""
-        if await self.is_on_cooldown(interaction.user.id):
+        if not text and not file:
+            await interaction.response.send_message("❌ Provide some text or a text file to summarize.", ephemeral=True)
+            return
+        
+        if file and file.size > BotConfig.AI_SUMMARY_MAX_FILE_BYTES:
             await interaction.response.send_message(
-                f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.",
+                f"❌ File is too large. The limit is {BotConfig.AI_SUMMARY_MAX_FILE_BYTES // 1024} KB.",
                 ephemeral=True
             )
             return
         
+        if not fast and not await self.check_ai_rate_limit(interaction):
+            return
+        
         await interaction.response.defer()
-        self.set_cooldown(interaction.user.id)
         
-        summary_prompt = f"Please provide a concise summary of the following text: {text}"
-        ai_response = await self.generate_ai_response(summary_prompt, interaction.user.display_name)
+        if file:
+            file_text = (await file.read()).decode('utf-8', errors='replace')
+            text = f"{text}\n\n{file_text}" if text else file_text
         
-        if ai_response:
-            embed = discord.Embed(
-                title="📝 Text Summary",
-                description=ai_response,
-                color=discord.Color.blue()
+        await self._summarize_text(
+            interaction, text, fast, "Please provide a concise summary of the following text"
+        )
+    
+    @app_commands.command(name="summarize-channel", description="Summarize recent messages in this channel")
+    @app_commands.describe(messages="How many recent messages to summarize",
+                           fast="Instant offline summary made of key messages")
+    async def summarize_channel(self, interaction: discord.Interaction, messages: int = 100, fast: bool = False):
+        """Summarize the channel's recent messages from the in-memory buffer"""
+        if hasattr(interaction.channel, 'name') and interaction.channel.name in BotConfig.AI_DISABLED_CHANNELS:
+            await interaction.response.send_message(
+                "🚫 AI chat is disabled in this channel.",
+                ephemeral=True
             )
-            embed.set_footer(text="Powered by OpenRouter")
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("🚫 Failed to generate summary.")
+            return
+        
+        messages = max(1, min(messages, BotConfig.AI_CHANNEL_BUFFER_SIZE))
+        # Blank lines keep each message a separate sentence for the offline summarizer
+        transcript = self._channel_transcript(
+            interaction.channel_id, interaction.guild, messages, separator='\n\n'
+        )
+        if not transcript:
+            await interaction.response.send_message(
+                "❌ I haven't seen any messages in this channel recently.",
+                ephemeral=True
+            )
+            return
+        
+        if not fast and not await self.check_ai_rate_limit(interaction):
+            return
+        
+        await interaction.response.defer()
+        await self._summarize_text(
+            interaction, transcript, fast,
+            "Please summarize this Discord conversation, covering the main topics, questions and decisions",
+            title="📝 Channel Summary"
+        )
     
     @app_commands.command(name="translate", description="Translate text to English")
     @app_commands.describe(text="Text to translate")
     async def translate(self, interaction: discord.Interaction, text: str):
         """Translate text to English"""
-        if await self.is_on_cooldown(interaction.user.id):
-            await interaction.response.send_message(
-                f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.",
-                ephemeral=True
-            )
+        language, confidence = detect_language(text)
+        confident = confidence >= BotConfig.AI_TRANSLATE_MIN_CONFIDENCE and len(text.split()) >= 3
+        language_name = LANGUAGE_NAMES.get(language, "Unknown") if confident else "Unknown"
+        self.logger.info(f"Translate request detected as {language or 'unknown'} ({confidence:.2f})")
+        
+        embed = discord.Embed(
+            title="🌐 Translation",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Original", value=text[:1000], inline=False)
+        
+        # English input needs no model call
+        if confident and language == 'en':
+            self.translations_skipped += 1
+            embed.add_field(name="Translation", value=text[:1024], inline=False)
+            embed.add_field(name="Detected Language", value=language_name, inline=True)
+            embed.set_footer(text="Already in English")
+            await interaction.response.send_message(embed=embed)
+            return
+        
+        if not await self.check_ai_rate_limit(interaction):
             return
         
         await interaction.response.defer()
-        self.set_cooldown(interaction.user.id)
         
-        translate_prompt = f"Please translate the following text to English. If it's already in English, just return the original text: {text}"
-        ai_response = await self.generate_ai_response(translate_prompt, interaction.user.display_name)
+        source = f" from {language_name}" if confident else ""
+        translate_prompt = f"Please translate the following text{source} to English. If it's already in English, just return the original text: {text}"
         
-        if ai_response:
-            embed = discord.Embed(
-                title="🌐 Translation",
-                color=discord.Color.blue()
-            )
-            embed.add_field(name="Original", value=text[:1000], inline=False)
-            embed.add_field(name="Translation", value=ai_response, inline=False)
-            embed.set_footer(text="Powered by OpenRouter")
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("🚫 Failed to translate text.")
+        embed.add_field(name="Translation", value="\u200b", inline=False)
+        embed.add_field(name="Detected Language", value=language_name, inline=True)
+        embed.set_footer(text="Powered by OpenRouter")
+        
+        def render(target: discord.Embed, translation: str):
+            target.set_field_at(1, name="Translation", value=translation[:1024], inline=False)
+        
+        await self._send_ai_embed(
+            functools.partial(interaction.followup.send, wait=True), embed,
+            translate_prompt, interaction.user.display_name, "🚫 Failed to translate text.",
+            render=render, mode='translate', guild_id=interaction.guild_id,
+            user_id=interaction.user.id, request_key=interaction.id, deadline=self._interaction_deadline(interaction)
+        )
     
     @app_commands.command(name="codegen", description="Generate code")
     @app_commands.describe(task="Describe what code you need")
     async def codegen(self, interaction: discord.Interaction, task: str):
         """Generate code using AI"""
-        if await self.is_on_cooldown(interaction.user.id):
-            await interaction.response.send_message(
-                f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.",
-                ephemeral=True
-            )
+        if not await self.check_ai_rate_limit(interaction):
             return
         
         await interaction.response.defer()
-        self.set_cooldown(interaction.user.id)
         
         code_prompt = f"Please generate clean, working code for this task: {task}. Provide only the code with minimal explanation."
-        ai_response = await self.generate_ai_response(code_prompt, interaction.user.display_name)
         
-        if ai_response:
-            embed = discord.Embed(
-                title="💻 Generated Code",
-                description=f"```\n{ai_response}\n```",
-                color=discord.Color.green()
-            )
-            embed.set_footer(text="Powered by OpenRouter")
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("🚫 Failed to generate code.")
+        embed = discord.Embed(
+            title="💻 Generated Code",
+            color=discord.Color.green()
+        )
+        embed.set_footer(text="Powered by OpenRouter")
+        
+        def render(target: discord.Embed, code: str):
+            target.description = f"```\n{code[:4088]}\n```"
+        
+        await self._send_ai_embed(
+            functools.partial(interaction.followup.send, wait=True), embed,
+            code_prompt, interaction.user.display_name, "🚫 Failed to generate code.",
+            render=render, mode='codegen', guild_id=interaction.guild_id,
+            user_id=interaction.user.id, request_key=interaction.id, deadline=self._interaction_deadline(interaction)
+        )
     
     @app_commands.command(name="agent", description="Talk to a custom AI agent")
     @app_commands.describe(persona="AI persona (helpful, creative, technical, etc.)", prompt="Your message")
     async def agent(self, interaction: discord.Interaction, persona: str, prompt: str):
         """Talk to a custom AI agent with specific persona"""
-        if await self.is_on_cooldown(interaction.user.id):
-            await interaction.response.send_message(
-                f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.",
-                ephemeral=True
-            )
+        if not await self.check_ai_rate_limit(interaction):
             return
         
         await interaction.response.defer()
-        self.set_cooldown(interaction.user.id)
         
         agent_prompt = f"Act as a {persona} assistant. Respond to this request: {prompt}"
-        ai_response = await self.generate_ai_response(agent_prompt, interaction.user.display_name)
         
-        if ai_response:
-            embed = discord.Embed(
-                title=f"🤖 {persona.title()} Agent",
-                description=ai_response,
-                color=discord.Color.purple()
-            )
-            embed.set_footer(text="Powered by OpenRouter")
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("🚫 Failed to generate agent response.")
+        embed = discord.Embed(
+            title=f"🤖 {persona.title()} Agent",
+            color=discord.Color.purple()
+        )
+        embed.set_footer(text="Powered by OpenRouter")
+        await self._send_ai_embed(
+            functools.partial(interaction.followup.send, wait=True), embed,
+            agent_prompt, interaction.user.display_name, "🚫 Failed to generate agent response.",
+            mode='agent', guild_id=interaction.guild_id,
+            user_id=interaction.user.id, request_key=interaction.id, deadline=self._interaction_deadline(interaction)
+        )
     
     @app_commands.command(name="roleplay", description="Roleplay with an AI character")
     @app_commands.describe(character="Character to roleplay as", prompt="Your message to the character")
     async def roleplay(self, interaction: discord.Interaction, character: str, prompt: str):
         """Roleplay with an AI character"""
-        if await self.is_on_cooldown(interaction.user.id):
-            await interaction.response.send_message(
-                f"⏰ Please wait {BotConfig.AI_COOLDOWN} seconds between AI requests.",
-                ephemeral=True
-            )
+        if not await self.check_ai_rate_limit(interaction):
             return
         
         await interaction.response.defer()
-        self.set_cooldown(interaction.user.id)
         
         roleplay_prompt = f"You are roleplaying as {character}. Stay in character and respond to: {prompt}"
-        ai_response = await self.generate_ai_response(roleplay_prompt, interaction.user.display_name)
         
-        if ai_response:
-            embed = discord.Embed(
-                title=f"🎭 {character}",
-                description=ai_response,
-                color=discord.Color.gold()
-            )
-            embed.set_footer(text="Powered by OpenRouter")
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("🚫 Failed to generate roleplay response.")
+        embed = discord.Embed(
+            title=f"🎭 {character}",
+            color=discord.Color.gold()
+        )
+        embed.set_footer(text="Powered by OpenRouter")
+        await self._send_ai_embed(
+            functools.partial(interaction.followup.send, wait=True), embed,
+            roleplay_prompt, interaction.user.display_name, "🚫 Failed to generate roleplay response.",
+            mode='roleplay', guild_id=interaction.guild_id,
+            user_id=interaction.user.id, request_key=interaction.id, deadline=self._interaction_deadline(interaction)
+        )
     
     @app_commands.command(name="ai-status", description="Check AI service status")
     async def ai_status(self, interaction: discord.Interaction):
-        """Check if AI service is working"""
-        await interaction.response.defer()
+        """Show AI service health from the background monitor"""
+        health = self.bot.ai_health
+        models = health.monitored_models()
         
-        try:
-            # Quick test of OpenRouter API
-            test_response = await self.generate_ai_response("Hi", "test_user")
-            
-            if test_response and not test_response.startswith("🚫"):
-                embed = discord.Embed(
-                    title="🟢 AI Service Status",
-                    description="AI service is operational",
-                    color=discord.Color.green()
-                )
-                embed.add_field(name="Model", value=BotConfig.OPENROUTER_MODEL, inline=True)
-                embed.add_field(name="Max Tokens", value=BotConfig.MAX_TOKENS, inline=True)
-                embed.add_field(name="Cooldown", value=f"{BotConfig.AI_COOLDOWN}s", inline=True)
-            else:
-                embed = discord.Embed(
-                    title="🔴 AI Service Status",
-                    description="AI service is currently unavailable",
-                    color=discord.Color.red()
-                )
-                embed.add_field(name="Response", value=test_response or "No response", inline=False)
-            
-        except Exception as e:
+        if not any(health.get(model).samples for model in models):
+            embed = discord.Embed(
+                title="🟡 AI Service Status",
+                description="No health data yet. The first probe runs shortly after startup.",
+                color=discord.Color.gold()
+            )
+        elif health.is_healthy(BotConfig.OPENROUTER_MODEL):
+            embed = discord.Embed(
+                title="🟢 AI Service Status",
+                description="AI service is operational",
+                color=discord.Color.green()
+            )
+        elif any(health.is_healthy(model) for model in models):
+            embed = discord.Embed(
+                title="🟡 AI Service Status",
+                description="Primary model is degraded, requests are using fallback models",
+                color=discord.Color.gold()
+            )
+        else:
             embed = discord.Embed(
                 title="🔴 AI Service Status",
                 description="AI service is currently unavailable",
                 color=discord.Color.red()
             )
-            embed.add_field(name="Error", value=str(e)[:100], inline=False)
         
-        await interaction.followup.send(embed=embed)
+        for model in models:
+            stats = health.get(model)
+            p50 = stats.latency_percentile(50)
+            p95 = stats.latency_percentile(95)
+            latency = f"p50 {p50 * 1000:.0f}ms, p95 {p95 * 1000:.0f}ms" if p50 is not None else "no successes"
+            last_ok = f"<t:{int(stats.last_success)}:R>" if stats.last_success else "never"
+            value = (
+                f"{stats.trend()} {'Healthy' if stats.healthy else 'Unhealthy'}\n"
+                f"Latency {latency}\n"
+                f"Errors {stats.error_rate:.0%} of {len(stats.samples)} checks\n"
+                f"Last success {last_ok}"
+            )
+            if not stats.healthy and stats.last_error:
+                value += f"\nLast error: {stats.last_error[:100]}"
+            embed.add_field(name=model, value=value, inline=False)
+        
+        embed.add_field(name="Max Tokens", value=BotConfig.MAX_TOKENS, inline=True)
+        embed.add_field(name="Cooldown", value=f"{BotConfig.AI_COOLDOWN}s", inline=True)
+        embed.add_field(
+            name="Response Cache",
+            value=f"{len(self.response_cache)} entries, {self.response_cache.hits} hits / "
+                  f"{self.response_cache.misses} misses ({self.response_cache.hit_rate:.0%})\n"
+                  f"Similar questions: {len(self.semantic_cache)} entries, {self.semantic_cache.hits} hits "
+                  f"({self.semantic_cache.hit_rate:.0%})",
+            inline=False
+        )
+        scheduler = self.bot.ai_scheduler
+        embed.add_field(
+            name="Request Queue",
+            value=f"{scheduler.running}/{scheduler.max_concurrency} running, {scheduler.queued} queued, "
+                  f"{scheduler.rejected} rejected\n"
+                  f"Wait p50 {scheduler.wait_percentile(50) * 1000:.0f}ms, "
+                  f"p95 {scheduler.wait_percentile(95) * 1000:.0f}ms",
+            inline=False
+        )
+        embed.add_field(
+            name="Translations",
+            value=f"{self.translations_skipped} already in English (no model call)",
+            inline=False
+        )
+        embed.add_field(
+            name="Offline Summaries",
+            value=f"{self.extractive_summaries} extractive summaries served",
+            inline=False
+        )
+        embed.add_field(name="Cancellations", value=self.bot.ai_requests.summary(), inline=False)
+        if BotConfig.AI_MODEL_TIERS:
+            embed.add_field(name="Model Routing", value=self.bot.ai_router.summary(), inline=False)
+        if BotConfig.AI_HEDGING:
+            hedging = self.bot.ai_client
+            embed.add_field(
+                name="Hedged Requests",
+                value=f"{hedging.hedge_rate:.0%} hedged, {hedging.win_rate:.0%} of hedges won "
+                      f"(delay {hedging.hedge_delay():.1f}s)",
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(AIChatCog(bot))
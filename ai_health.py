@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from config import BotConfig
+from utils.openrouter import OpenRouterClient
+
+class ModelHealth:
+    """Rolling health statistics for one model
+
+    Samples are (timestamp, latency, ok) tuples in a ring buffer, so the
+    numbers always describe recent behaviour.
+    """
+
+    def __init__(self, window: int):
+        self.samples: Deque[Tuple[float, float, bool]] = deque(maxlen=window)
+        self.last_success: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def record(self, latency: float, ok: bool, error: Optional[str] = None):
+        """Add a sample"""
+        now = time.time()
+        self.samples.append((now, latency, ok))
+        if ok:
+            self.last_success = now
+        else:
+            self.last_error = error
+
+    @staticmethod
+    def _error_rate(samples) -> float:
+        return sum(1 for _, _, ok in samples if not ok) / len(samples) if samples else 0.0
+
+    @staticmethod
+    def _latency_percentile(samples, percentile: float) -> Optional[float]:
+        latencies = sorted(latency for _, latency, ok in samples if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100))]
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of recent samples that failed"""
+        return self._error_rate(self.samples)
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency of successful samples at the given percentile, in seconds"""
+        return self._latency_percentile(self.samples, percentile)
+
+    def trend(self) -> str:
+        """Compare the newer half of the window with the older half"""
+        if len(self.samples) < 4:
+            return "→"
+        samples = list(self.samples)
+        older, newer = samples[:len(samples) // 2], samples[len(samples) // 2:]
+        error_change = self._error_rate(newer) - self._error_rate(older)
+        if error_change > 0.1:
+            return "↘"
+        if error_change < -0.1:
+            return "↗"
+        old_p50 = self._latency_percentile(older, 50)
+        new_p50 = self._latency_percentile(newer, 50)
+        if old_p50 and new_p50:
+            if new_p50 > old_p50 * 1.25:
+                return "↘"
+            if new_p50 < old_p50 * 0.8:
+                return "↗"
+        return "→"
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the model is fit to route traffic to"""
+        if len(self.samples) < BotConfig.AI_HEALTH_MIN_SAMPLES:
+            return True
+        return self.error_rate <= BotConfig.AI_HEALTH_MAX_ERROR_RATE
+
+class AIHealthMonitor:
+    """Background prober that keeps per-model health statistics
+
+    Every AI_HEALTH_INTERVAL seconds each configured model gets a minimal
+    one-token probe. Live traffic can report into the same statistics via
+    record(), so /ai-status and routing read a ready snapshot.
+    """
+
+    def __init__(self, client: OpenRouterClient):
+        self.client = client
+        self.logger = logging.getLogger('ai_health')
+        self.models: Dict[str, ModelHealth] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, model: str) -> ModelHealth:
+        """Health statistics for a model"""
+        if model not in self.models:
+            self.models[model] = ModelHealth(BotConfig.AI_HEALTH_WINDOW)
+        return self.models[model]
+
+    def record(self, model: str, latency: float, ok: bool, error: Optional[str] = None):
+        """Report the outcome of a request to model"""
+        self.get(model).record(latency, ok, error)
+
+    def is_healthy(self, model: str) -> bool:
+        """Whether model looks healthy (unknown models are assumed healthy)"""
+        return model not in self.models or self.models[model].healthy
+
+    def monitored_models(self) -> List[str]:
+        """Models that are probed"""
+        return list(dict.fromkeys([BotConfig.OPENROUTER_MODEL, *BotConfig.OPENROUTER_FALLBACK_MODELS]))
+
+    async def probe(self, model: str):
+        """Send one minimal request to model and record the result"""
+        started = time.monotonic()
+        try:
+            await self.client.chat_completion(
+                [{"role": "user", "content": "ping"}], model=model, max_tokens=1, temperature=0
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.record(model, time.monotonic() - started, False, str(e)[:200])
+        else:
+            self.record(model, time.monotonic() - started, True)
+
+    async def _run(self):
+        """Probe loop"""
+        while True:
+            await asyncio.gather(*(self.probe(model) for model in self.monitored_models()))
+            await asyncio.sleep(BotConfig.AI_HEALTH_INTERVAL)
+
+    def start(self):
+        """Start probing in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"AI health monitor started (every {BotConfig.AI_HEALTH_INTERVAL}s)")
+
+    async def stop(self):
+        """Stop probing"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
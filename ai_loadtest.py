@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Load harness for the AI path.
+Drives AIChatCog.generate_ai_response or a slash command handler against the
+fake OpenRouter server and reports throughput and latency percentiles.
+
+    python ai_loadtest.py --target generate --concurrency 20 --requests 500
+    python ai_loadtest.py --target chat --stream --requests 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AI path load test")
+    parser.add_argument('--target', default='generate',
+                        choices=['generate', 'chat', 'summarize', 'translate', 'codegen', 'agent', 'roleplay'])
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--guilds', type=int, default=5, help="distinct guild ids to spread load over")
+    parser.add_argument('--distinct-prompts', type=int, default=50, help="size of the prompt pool")
+    parser.add_argument('--stream', action='store_true', help="exercise the streaming path")
+    parser.add_argument('--base-url', help="use an already running server instead of starting one")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--tokens-per-second', type=float, default=200.0)
+    return parser.parse_args()
+
+ARGS = parse_args()
+
+# Configure the bot before config is imported
+os.environ['OPENROUTER_BASE_URL'] = ARGS.base_url or f"http://127.0.0.1:{ARGS.port}"
+os.environ.setdefault('OPENROUTER_API_KEY', 'loadtest')
+os.environ['AI_STREAMING'] = 'true' if ARGS.stream else 'false'
+os.environ.setdefault('AI_STREAM_EDIT_INTERVAL', '0')
+os.environ.setdefault('AI_COOLDOWN', '0')
+
+import discord
+from fake_openrouter import FakeOpenRouter, start_server
+from utils.openrouter import OpenRouterClient
+from utils.ai_scheduler import AIScheduler
+from utils.resilience import ResilientOpenRouterClient
+from utils.hedging import HedgedOpenRouterClient
+from utils.ai_health import AIHealthMonitor
+from utils.ai_router import ModelRouter
+from utils.ai_requests import AIRequestTracker
+from utils.filters import MessageFilter
+from utils.usage_meter import UsageMeter
+from cogs.ai_chat import AIChatCog
+
+class FakeMessage:
+    """Sent message stand-in that accepts edits"""
+
+    def __init__(self):
+        self.id = random.getrandbits(63)
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+
+class FakeResponse:
+    async def send_message(self, *args, **kwargs):
+        pass
+
+    async def defer(self, *args, **kwargs):
+        pass
+
+class FakeFollowup:
+    async def send(self, *args, **kwargs):
+        return FakeMessage()
+
+def fake_interaction(user_id: int, guild_id: int):
+    """Interaction stand-in with just enough surface for the AI command handlers"""
+    return SimpleNamespace(
+        id=random.getrandbits(63),
+        created_at=discord.utils.utcnow(),
+        user=SimpleNamespace(id=user_id, display_name=f"user{user_id}",
+                             display_avatar=SimpleNamespace(url="https://example.invalid/avatar.png")),
+        guild_id=guild_id,
+        guild=SimpleNamespace(id=guild_id),
+        channel_id=guild_id * 10,
+        channel=SimpleNamespace(id=guild_id * 10, name="general"),
+        response=FakeResponse(),
+        followup=FakeFollowup()
+    )
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+async def run():
+    runner = None
+    if not ARGS.base_url:
+        server = FakeOpenRouter(ARGS.latency, ARGS.jitter, ARGS.error_rate, ARGS.tokens_per_second)
+        runner = await start_server(server, port=ARGS.port)
+
+    openrouter = OpenRouterClient()
+    await openrouter.start()
+    health = AIHealthMonitor(openrouter)
+    bot = SimpleNamespace(
+        openrouter=openrouter,
+        ai_health=health,
+        ai_router=ModelRouter(health),
+        ai_client=HedgedOpenRouterClient(ResilientOpenRouterClient(openrouter, health)),
+        ai_scheduler=AIScheduler.from_config(),
+        ai_requests=AIRequestTracker(),
+        ai_usage=UsageMeter(':memory:', flush_interval=60),
+        message_filter=MessageFilter(),
+        user=None
+    )
+    cog = AIChatCog(bot)
+
+    prompts = [f"Question number {i}: tell me something about topic {i}." for i in range(ARGS.distinct_prompts)]
+    latencies = []
+    failures = 0
+    queue = asyncio.Queue()
+    for i in range(ARGS.requests):
+        queue.put_nowait(i)
+
+    async def worker():
+        nonlocal failures
+        while not queue.empty():
+            i = queue.get_nowait()
+            guild_id = i % ARGS.guilds + 1
+            prompt = random.choice(prompts)
+            started = time.perf_counter()
+            try:
+                if ARGS.target == 'generate':
+                    response = await cog.generate_ai_response(prompt, f"user{i}", guild_id=guild_id)
+                    if not response or response.startswith(("🚫", "🚦")):
+                        failures += 1
+                else:
+                    command = {
+                        'chat': cog.chat_command, 'summarize': cog.summarize, 'translate': cog.translate,
+                        'codegen': cog.codegen, 'agent': cog.agent, 'roleplay': cog.roleplay
+                    }[ARGS.target]
+                    interaction = fake_interaction(i, guild_id)
+                    extra = ("helpful",) if ARGS.target in ('agent', 'roleplay') else ()
+                    await command.callback(cog, interaction, *extra, prompt)
+            except Exception as e:
+                failures += 1
+                print(f"request {i} raised: {e}", file=sys.stderr)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(ARGS.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    await openrouter.close()
+    if runner:
+        await runner.cleanup()
+
+    print(f"target={ARGS.target} stream={ARGS.stream} concurrency={ARGS.concurrency} requests={ARGS.requests}")
+    print(f"throughput: {ARGS.requests / elapsed:.1f} req/s over {elapsed:.2f}s, failures: {failures}")
+    print(f"latency p50={percentile(latencies, 50) * 1000:.0f}ms "
+          f"p95={percentile(latencies, 95) * 1000:.0f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.0f}ms")
+    print(f"cache: {cog.response_cache.hits} hits / {cog.response_cache.misses} misses, "
+          f"coalesced: {cog.in_flight.coalesced}, "
+          f"queue wait p95: {bot.ai_scheduler.wait_percentile(95) * 1000:.0f}ms, "
+          f"rejected: {bot.ai_scheduler.rejected}")
+    print(f"tokens metered: {bot.ai_usage.total_today()}")
+    if bot.ai_router.decisions:
+        print(f"routing:\n{bot.ai_router.summary()}")
+    if bot.ai_client.hedged:
+        print(f"hedging: {bot.ai_client.hedge_rate:.0%} hedged, {bot.ai_client.win_rate:.0%} won")
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional
+
+from config import BotConfig
+from utils.conversation_memory import estimate_tokens
+
+class GenerationProfile:
+    """Generation settings for one AI mode
+
+    The token budget scales with the input: base_tokens plus tokens_per_input
+    for every estimated input token, clamped to [min_tokens, max_tokens].
+    A model set here bypasses the model router. Only profiles that address_user
+    put the user's name in the prompt; the others' answers can be shared
+    between users. Stop sequences may contain {user_turn}, filled in per request.
+    """
+
+    def __init__(self, base_tokens: int, tokens_per_input: float = 0.0, min_tokens: int = 16,
+                 max_tokens: Optional[int] = None, temperature: float = 0.7,
+                 stop: Optional[List[str]] = None, model: Optional[str] = None,
+                 address_user: bool = False):
+        self.base_tokens = base_tokens
+        self.tokens_per_input = tokens_per_input
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.stop = stop
+        self.model = model
+        self.address_user = address_user
+
+    def token_budget(self, text: str) -> int:
+        """max_tokens for a request with the given input"""
+        cap = min(self.max_tokens or BotConfig.MAX_TOKENS, BotConfig.MAX_TOKENS)
+        budget = self.base_tokens + int(self.tokens_per_input * estimate_tokens(text))
+        return max(self.min_tokens, min(budget, cap))
+
+    def user_turn(self, user_name: str) -> str:
+        """Marker the prompt puts before a message from user_name"""
+        return f"User {user_name} says:" if self.address_user else "User says:"
+
+    def stop_sequences(self, user_name: str) -> Optional[List[str]]:
+        """Stop sequences for a request from user_name"""
+        if not self.stop:
+            return None
+        return [stop.format(user_turn=self.user_turn(user_name)) for stop in self.stop]
+
+# Stops the model from writing the user's next turn itself, without cutting
+# off answers that merely start a line with "User"
+DIALOGUE_STOP = ["\n{user_turn}"]
+
+PROFILES: Dict[str, GenerationProfile] = {
+    'chat': GenerationProfile(base_tokens=400, temperature=0.7, stop=DIALOGUE_STOP),
+    'mention': GenerationProfile(base_tokens=300, temperature=0.7, stop=DIALOGUE_STOP),
+    'summarize': GenerationProfile(base_tokens=120, tokens_per_input=0.25, max_tokens=600, temperature=0.3),
+    'translate': GenerationProfile(base_tokens=32, tokens_per_input=1.5, temperature=0.2),
+    'codegen': GenerationProfile(base_tokens=1200, temperature=0.2),
+    'agent': GenerationProfile(base_tokens=600, temperature=0.7, stop=DIALOGUE_STOP),
+    # A character speaks to the user by name, at the cost of never sharing answers
+    'roleplay': GenerationProfile(base_tokens=500, temperature=0.9, stop=DIALOGUE_STOP, address_user=True),
+}
+
+# Per-mode model overrides from the environment
+for _mode, _model in BotConfig.AI_MODE_MODELS.items():
+    if _mode in PROFILES:
+        PROFILES[_mode].model = _model
+
+def get_profile(mode: str) -> GenerationProfile:
+    """Generation profile for a mode, using the chat profile for unknown modes"""
+    return PROFILES.get(mode, PROFILES['chat'])
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Awaitable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar('T')
+
+class AIRequestCancelled(Exception):
+    """Raised when tracked AI work was cancelled before it finished"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"AI request cancelled: {reason}")
+        self.reason = reason
+
+class AIRequestTracker:
+    """Registry of in-flight AI work with deadlines and cancellation
+
+    Each piece of work runs as its own task, keyed by whatever the result
+    will be delivered to (an interaction or message id). When the deadline
+    passes, the key is cancelled (e.g. the prompt message was deleted) or the
+    bot shuts down, the task is cancelled. The cancellation reaches the
+    upstream HTTP request and frees its scheduler slot.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger('ai_requests')
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._reasons: Dict[asyncio.Task, str] = {}
+
+        # Metrics
+        self.started = 0
+        self.cancellations: Counter = Counter()
+
+    async def run(self, key: Optional[Hashable], work: Awaitable[T], deadline: Optional[float] = None) -> T:
+        """Await work, cancelling it at deadline (a time.monotonic() value) or on request
+
+        Raises AIRequestCancelled with the reason if the work was cancelled.
+        """
+        task = asyncio.ensure_future(work)
+        # Anonymous work is still tracked so shutdown can cancel it
+        key = object() if key is None else key
+        self._tasks[key] = task
+        self.started += 1
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if not done:
+                self._cancel(task, 'deadline')
+                await asyncio.gather(task, return_exceptions=True)
+        except asyncio.CancelledError:
+            # Whoever awaited us gave up, so nobody is left to deliver the result
+            self._cancel(task, 'caller cancelled')
+            raise
+        finally:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+        if task.cancelled():
+            reason = self._reasons.pop(task, 'cancelled')
+            self.cancellations[reason] += 1
+            self.logger.info(f"Cancelled AI request ({reason})")
+            raise AIRequestCancelled(reason)
+        return task.result()
+
+    def _cancel(self, task: asyncio.Task, reason: str):
+        """Cancel a task, remembering why"""
+        if not task.done():
+            self._reasons.setdefault(task, reason)
+            task.cancel()
+
+    def cancel(self, key: Hashable, reason: str) -> bool:
+        """Cancel the work registered under key, returning whether there was any"""
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            return False
+        self._cancel(task, reason)
+        return True
+
+    def cancel_all(self, reason: str) -> int:
+        """Cancel all in-flight work, returning how many requests were cancelled"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            self._cancel(task, reason)
+        return len(tasks)
+
+    def summary(self) -> str:
+        """Cancellation counts by reason as text"""
+        total = sum(self.cancellations.values())
+        if not total:
+            return f"{len(self._tasks)} in flight, none cancelled"
+        reasons = ', '.join(f"{reason} {count}" for reason, count in self.cancellations.most_common())
+        return f"{len(self._tasks)} in flight, {total} of {self.started} cancelled ({reasons})"
+
+    def __len__(self) -> int:
+        return len(self._tasks)
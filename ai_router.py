@@ -0,0 +1,81 @@
+import logging
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from config import BotConfig
+from utils.ai_health import AIHealthMonitor
+
+# Modes whose short prompts are cheap enough for the smallest tier
+LIGHT_MODES = {'chat', 'mention', 'translate'}
+
+class ModelRouter:
+    """Pick a model from the configured tier list for each request
+
+    Tiers are ordered from smallest/fastest to largest context. Short prompts
+    in light modes go to the first tier, long prompts to the tier with the
+    largest context window, everything else to the default model. A tier the
+    health monitor reports as unhealthy or too slow is skipped in favour of
+    the next fitting one.
+    """
+
+    def __init__(self, health: Optional[AIHealthMonitor] = None):
+        self.logger = logging.getLogger('ai_router')
+        self.health = health
+        # (tier name, model, context window)
+        self.tiers: List[Tuple[str, str, int]] = BotConfig.AI_MODEL_TIERS
+        self.decisions: Counter = Counter()
+
+    def _usable(self, model: str) -> bool:
+        """Whether live stats allow routing to model"""
+        if not self.health:
+            return True
+        if not self.health.is_healthy(model):
+            return False
+        p95 = self.health.get(model).latency_percentile(95)
+        return p95 is None or p95 <= BotConfig.AI_ROUTER_MAX_P95
+
+    def route(self, mode: str, prompt_tokens: int, max_tokens: int, preferred: Optional[str] = None) -> str:
+        """Model for a request of the given mode and size"""
+        if preferred:
+            self._record('override', preferred)
+            return preferred
+        if not self.tiers:
+            return BotConfig.OPENROUTER_MODEL
+
+        needed = prompt_tokens + max_tokens
+        fitting = [tier for tier in self.tiers if tier[2] >= needed]
+        if not fitting:
+            # Nothing is big enough, the largest window truncates least
+            name, model, _ = max(self.tiers, key=lambda tier: tier[2])
+            self._record('oversize', model, name)
+            return model
+
+        if mode in LIGHT_MODES and prompt_tokens <= BotConfig.AI_ROUTER_SMALL_PROMPT:
+            reason, order = 'small', fitting
+        elif prompt_tokens >= BotConfig.AI_ROUTER_LONG_PROMPT:
+            reason, order = 'long', sorted(fitting, key=lambda tier: -tier[2])
+        else:
+            default = [tier for tier in fitting if tier[1] == BotConfig.OPENROUTER_MODEL]
+            reason, order = 'default', default + [tier for tier in fitting if tier not in default]
+
+        for index, (name, model, _) in enumerate(order):
+            if self._usable(model):
+                self._record(reason if index == 0 else f"{reason}-degraded", model, name)
+                return model
+
+        # Every fitting tier looks bad, use the first choice anyway
+        name, model, _ = order[0]
+        self._record(f"{reason}-unhealthy", model, name)
+        return model
+
+    def _record(self, reason: str, model: str, tier: Optional[str] = None):
+        """Count a routing decision"""
+        self.decisions[(tier or model, reason)] += 1
+
+    def summary(self, limit: int = 5) -> str:
+        """Most common routing decisions as text"""
+        if not self.decisions:
+            return "No routing decisions yet"
+        return '\n'.join(
+            f"{tier} ({reason}): {count}" for (tier, reason), count in self.decisions.most_common(limit)
+        )
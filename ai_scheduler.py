@@ -0,0 +1,127 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from config import BotConfig
+
+T = TypeVar('T')
+
+class AIQueueFullError(Exception):
+    """Raised when a request is rejected because the AI queue is full"""
+
+class AIScheduler:
+    """Global AI request scheduler with a concurrency cap and per-guild weighted fair queuing
+
+    Waiting requests are ordered by start-time fair queuing: each guild's
+    requests are tagged with a virtual start time that advances by 1/weight,
+    so a busy guild cannot starve the others.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue: int, max_guild_queue: int,
+                 guild_weights: Optional[Dict[int, float]] = None):
+        self.logger = logging.getLogger('ai_scheduler')
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_guild_queue = max_guild_queue
+        self.guild_weights = guild_weights or {}
+
+        self.running = 0
+        self._queue: List[Tuple[float, int, asyncio.Future]] = []
+        self._guild_queued: Dict[Optional[int], int] = defaultdict(int)
+        self._guild_tags: Dict[Optional[int], float] = {}
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+
+        # Metrics
+        self.submitted = 0
+        self.rejected = 0
+        self.wait_times = deque(maxlen=1000)
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot"""
+        return sum(self._guild_queued.values())
+
+    def saturated(self, guild_id: Optional[int]) -> bool:
+        """Whether a new request from guild_id would be rejected right now"""
+        if self.running < self.max_concurrency:
+            return False
+        return self.queued >= self.max_queue or self._guild_queued.get(guild_id, 0) >= self.max_guild_queue
+
+    async def submit(self, guild_id: Optional[int], factory: Callable[[], Awaitable[T]]) -> T:
+        """Run factory once a slot is free, queuing fairly behind other guilds"""
+        self.submitted += 1
+        enqueued_at = time.monotonic()
+
+        if self.running >= self.max_concurrency:
+            await self._wait_for_slot(guild_id)
+        else:
+            self.running += 1
+
+        self.wait_times.append(time.monotonic() - enqueued_at)
+        try:
+            return await factory()
+        finally:
+            self._release()
+
+    async def _wait_for_slot(self, guild_id: Optional[int]):
+        """Queue until the dispatcher hands this request a slot"""
+        if self.queued >= self.max_queue or self._guild_queued[guild_id] >= self.max_guild_queue:
+            self.rejected += 1
+            self.logger.warning(f"Rejected AI request from guild {guild_id}: queue full")
+            raise AIQueueFullError(f"AI queue is full (guild {guild_id})")
+
+        weight = self.guild_weights.get(guild_id, 1.0)
+        tag = max(self._virtual_time, self._guild_tags.get(guild_id, 0.0)) + 1.0 / weight
+        self._guild_tags[guild_id] = tag
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (tag, next(self._sequence), future))
+        self._guild_queued[guild_id] += 1
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as we were cancelled, pass it on
+                self._release()
+            raise
+        finally:
+            self._guild_queued[guild_id] -= 1
+            if not self._guild_queued[guild_id]:
+                # An idle guild rejoins at the current virtual time
+                del self._guild_queued[guild_id]
+                self._guild_tags.pop(guild_id, None)
+
+    def _release(self):
+        """Free a slot and hand it to the next fairly queued request"""
+        self.running -= 1
+        while self._queue and self.running < self.max_concurrency:
+            tag, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._virtual_time = tag
+            self.running += 1
+            future.set_result(None)
+
+    def wait_percentile(self, percentile: float) -> float:
+        """Queue wait time at the given percentile (0-100), in seconds"""
+        if not self.wait_times:
+            return 0.0
+        ordered = sorted(self.wait_times)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    @classmethod
+    def from_config(cls) -> 'AIScheduler':
+        """Build a scheduler from BotConfig settings"""
+        return cls(
+            max_concurrency=BotConfig.AI_MAX_CONCURRENCY,
+            max_queue=BotConfig.AI_MAX_QUEUE,
+            max_guild_queue=BotConfig.AI_MAX_GUILD_QUEUE,
+            guild_weights=BotConfig.AI_GUILD_WEIGHTS
+        )
@@ -9,6 +9,15 @@ import sys
 
 from config import BotConfig
 from utils.logging import setup_logging
+from utils.openrouter import OpenRouterClient
+from utils.ai_scheduler import AIScheduler
+from utils.resilience import ResilientOpenRouterClient
+from utils.hedging import HedgedOpenRouterClient
+from utils.ai_health import AIHealthMonitor
+from utils.ai_router import ModelRouter
+from utils.ai_requests import AIRequestTracker
+from utils.usage_meter import UsageMeter
+from utils.filters import MessageFilter
 from cogs.ai_chat import AIChatCog
 from cogs.moderation import ModerationCog
 from cogs.admin import AdminCog
@@ -37,9 +46,23 @@ class DiscordBot(commands.Bot):
         
         self.start_time = datetime.now()
         self.logger = logging.getLogger('bot')
+        self.openrouter = OpenRouterClient()
+        self.ai_health = AIHealthMonitor(self.openrouter)
+        self.ai_router = ModelRouter(self.ai_health)
+        self.ai_client = HedgedOpenRouterClient(ResilientOpenRouterClient(self.openrouter, self.ai_health))
+        self.ai_scheduler = AIScheduler.from_config()
+        self.ai_requests = AIRequestTracker()
+        self.ai_usage = UsageMeter(BotConfig.AI_USAGE_DB, BotConfig.AI_USAGE_FLUSH_INTERVAL)
+        # One filter, and one cached analysis per message, for every cog
+        self.message_filter = MessageFilter()
         
     async def setup_hook(self):
         """Called when the bot is starting up"""
+        # Open the shared OpenRouter connection pool
+        await self.openrouter.start()
+        self.ai_health.start()
+        await self.ai_usage.start()
+        
         # Load cogs
         await self.add_cog(AIChatCog(self))
         await self.add_cog(ModerationCog(self))
@@ -57,6 +80,17 @@ class DiscordBot(commands.Bot):
         except Exception as e:
             self.logger.error(f"Failed to sync commands: {e}")
     
+    async def close(self):
+        """Called when the bot is shutting down"""
+        # Answers still being generated can't be delivered anymore
+        cancelled = self.ai_requests.cancel_all('shutdown')
+        if cancelled:
+            self.logger.info(f"Cancelled {cancelled} in-flight AI request(s)")
+        await self.ai_health.stop()
+        await self.ai_usage.stop()
+        await self.openrouter.close()
+        await super().close()
+    
     async def on_ready(self):
         """Called when the bot is ready"""
         self.logger.info(f'{self.user} has connected to Discord!')
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict, deque
+from typing import Collection, Deque, Dict, List, NamedTuple, Optional
+
+class BufferedMessage(NamedTuple):
+    """Compact record of one channel message"""
+    message_id: int
+    author_id: int
+    timestamp: float  # unix time the message was sent
+    content: str
+
+class ChannelBuffer:
+    """Rolling in-memory history of recent messages per channel
+
+    Fed from gateway message events, so recent channel context is available
+    without channel.history() REST calls. Records are kept in step with
+    message edits and deletions through update() and remove(). Each channel keeps its latest
+    max_messages in a ring buffer. Channels with no messages for idle_timeout
+    seconds are dropped by a periodic sweep, and the least recently active
+    channels are evicted past max_channels.
+    """
+
+    def __init__(self, max_messages: int, max_channels: int, idle_timeout: float,
+                 sweep_interval: float = 60.0):
+        self.max_messages = max_messages
+        self.max_channels = max_channels
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+        self._channels: "OrderedDict[int, Deque[BufferedMessage]]" = OrderedDict()
+        # channel id -> monotonic time of its latest message
+        self._last_active: Dict[int, float] = {}
+        self._last_sweep = time.monotonic()
+
+    def record(self, channel_id: int, message_id: int, author_id: int, content: str,
+               timestamp: Optional[float] = None):
+        """Append a message to its channel's buffer"""
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        messages = self._channels.get(channel_id)
+        if messages is None:
+            messages = deque(maxlen=self.max_messages)
+            self._channels[channel_id] = messages
+        self._channels.move_to_end(channel_id)
+        self._last_active[channel_id] = now
+
+        messages.append(BufferedMessage(
+            message_id, author_id, time.time() if timestamp is None else timestamp, content
+        ))
+
+        while len(self._channels) > self.max_channels:
+            oldest, _ = self._channels.popitem(last=False)
+            self._last_active.pop(oldest, None)
+
+    def update(self, channel_id: int, message_id: int, content: str) -> bool:
+        """Replace the content of a buffered message, returning False if it is not buffered"""
+        messages = self._channels.get(channel_id, ())
+        for index, message in enumerate(messages):
+            if message.message_id == message_id:
+                messages[index] = message._replace(content=content)
+                return True
+        return False
+
+    def remove(self, channel_id: int, message_ids: Collection[int]) -> int:
+        """Drop buffered messages by id, returning how many were dropped"""
+        messages = self._channels.get(channel_id)
+        if not messages:
+            return 0
+        kept = [message for message in messages if message.message_id not in message_ids]
+        removed = len(messages) - len(kept)
+        if removed:
+            messages.clear()
+            messages.extend(kept)
+        return removed
+
+    def recent(self, channel_id: int, limit: Optional[int] = None) -> List[BufferedMessage]:
+        """Latest messages of a channel, oldest first"""
+        messages = self._channels.get(channel_id)
+        if not messages:
+            return []
+        if limit is None or limit >= len(messages):
+            return list(messages)
+        return list(messages)[-limit:] if limit > 0 else []
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop channels idle for longer than idle_timeout, returning how many were dropped"""
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+
+        idle = [
+            channel_id for channel_id, last_active in self._last_active.items()
+            if now - last_active >= self.idle_timeout
+        ]
+        for channel_id in idle:
+            del self._last_active[channel_id]
+            self._channels.pop(channel_id, None)
+        return len(idle)
+
+    def clear(self, channel_id: int):
+        """Forget a channel's messages"""
+        self._channels.pop(channel_id, None)
+        self._last_active.pop(channel_id, None)
+
+    def __len__(self) -> int:
+        return len(self._channels)
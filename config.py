@@ -10,17 +10,80 @@ class BotConfig:
     # OpenRouter settings
     OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
     OPENROUTER_MODEL = os.getenv('OPENROUTER_MODEL', 'google/gemma-3-12b-it:free')
+    # Tried in order when the primary model is failing or its circuit is open
+    OPENROUTER_FALLBACK_MODELS = [
+        model.strip() for model in os.getenv('OPENROUTER_FALLBACK_MODELS', '').split(',')
+        if model.strip()
+    ]
+    # Per-mode model overrides, e.g. "translate:some/small-model,summarize:some/long-context-model"
+    AI_MODE_MODELS = {
+        mode.strip(): model.strip()
+        for mode, model in (
+            entry.split(':', 1) for entry in os.getenv('AI_MODE_MODELS', '').split(',')
+            if ':' in entry
+        )
+    }
     MAX_TOKENS = int(os.getenv('MAX_TOKENS', '1500'))
+    # Model tiers for routing, smallest first: "name=model@context_tokens,..."
+    AI_MODEL_TIERS = [
+        (name.strip(), model.strip(), int(context))
+        for name, model, context in (
+            (entry.split('=', 1)[0], *entry.split('=', 1)[1].rsplit('@', 1))
+            for entry in os.getenv('AI_MODEL_TIERS', '').split(',')
+            if '=' in entry and '@' in entry
+        )
+    ]
+    AI_ROUTER_SMALL_PROMPT = int(os.getenv('AI_ROUTER_SMALL_PROMPT', '200'))  # tokens, light modes go to the first tier
+    AI_ROUTER_LONG_PROMPT = int(os.getenv('AI_ROUTER_LONG_PROMPT', '3000'))  # tokens, goes to the largest context tier
+    AI_ROUTER_MAX_P95 = float(os.getenv('AI_ROUTER_MAX_P95', '20'))  # seconds, slower tiers are skipped
+    OPENROUTER_BASE_URL = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
+    OPENROUTER_MAX_CONNECTIONS = int(os.getenv('OPENROUTER_MAX_CONNECTIONS', '20'))
+    OPENROUTER_KEEPALIVE = float(os.getenv('OPENROUTER_KEEPALIVE', '60'))  # seconds idle connections stay open
+    OPENROUTER_TIMEOUT = float(os.getenv('OPENROUTER_TIMEOUT', '60'))  # total seconds per non-streamed request
+    OPENROUTER_STREAM_IDLE_TIMEOUT = float(os.getenv('OPENROUTER_STREAM_IDLE_TIMEOUT', '60'))  # seconds without stream data
+    OPENROUTER_CONNECT_TIMEOUT = float(os.getenv('OPENROUTER_CONNECT_TIMEOUT', '10'))
+    AI_MAX_RETRIES = int(os.getenv('AI_MAX_RETRIES', '2'))  # retries per model on 429/5xx
+    AI_RETRY_BASE_DELAY = float(os.getenv('AI_RETRY_BASE_DELAY', '0.5'))  # seconds, doubled per attempt
+    AI_RETRY_MAX_DELAY = float(os.getenv('AI_RETRY_MAX_DELAY', '8'))
+    AI_BREAKER_THRESHOLD = int(os.getenv('AI_BREAKER_THRESHOLD', '3'))  # failed requests before a model's circuit opens
+    AI_BREAKER_RESET = float(os.getenv('AI_BREAKER_RESET', '30'))  # seconds before a trial request
+    AI_REQUEST_TIMEOUT = float(os.getenv('AI_REQUEST_TIMEOUT', '300'))  # seconds to produce one answer, including queueing
+    
+    # Hedged requests: race a second request when the first byte is slow
+    AI_HEDGING = os.getenv('AI_HEDGING', 'false').lower() == 'true'
+    AI_HEDGE_MODEL = os.getenv('AI_HEDGE_MODEL', '')  # defaults to the first fallback model
+    AI_HEDGE_PERCENTILE = float(os.getenv('AI_HEDGE_PERCENTILE', '90'))  # of recent first-byte latency
+    AI_HEDGE_DELAY = float(os.getenv('AI_HEDGE_DELAY', '5'))  # seconds, until enough samples exist
+    AI_HEDGE_MIN_DELAY = float(os.getenv('AI_HEDGE_MIN_DELAY', '1'))
+    AI_HEDGE_MIN_SAMPLES = int(os.getenv('AI_HEDGE_MIN_SAMPLES', '20'))
+    AI_HEDGE_WINDOW = int(os.getenv('AI_HEDGE_WINDOW', '200'))  # latency samples kept
     
+    # Background AI health monitor
+    AI_HEALTH_INTERVAL = float(os.getenv('AI_HEALTH_INTERVAL', '60'))  # seconds between probes
+    AI_HEALTH_WINDOW = int(os.getenv('AI_HEALTH_WINDOW', '100'))  # samples kept per model
+    AI_HEALTH_MIN_SAMPLES = int(os.getenv('AI_HEALTH_MIN_SAMPLES', '5'))  # before a model can be judged
+    AI_HEALTH_MAX_ERROR_RATE = float(os.getenv('AI_HEALTH_MAX_ERROR_RATE', '0.5'))
+
     # Moderation settings
     MAX_MESSAGE_LENGTH = int(os.getenv('MAX_MESSAGE_LENGTH', '2000'))
-    SPAM_THRESHOLD = int(os.getenv('SPAM_THRESHOLD', '5'))  # messages per minute
+    SPAM_THRESHOLD = int(os.getenv('SPAM_THRESHOLD', '5'))  # messages per SPAM_WINDOW (0 disables)
+    SPAM_WINDOW = float(os.getenv('SPAM_WINDOW', '60'))  # seconds
+    # Per-guild spam threshold and window, e.g. "123456789:10:30" for 10 messages per 30 seconds
+    SPAM_GUILD_LIMITS = {
+        int(parts[0]): (int(parts[1]), float(parts[2]))
+        for parts in (entry.strip().split(':') for entry in os.getenv('SPAM_GUILD_LIMITS', '').split(','))
+        if len(parts) == 3
+    }
     
-    # Auto-moderation keywords (can be expanded via environment)
+    # Auto-moderation keywords (can be expanded via environment).
+    # "word~2" allows that word up to 2 edits when fuzzy matching is on.
     FILTERED_WORDS = [
         word.strip() for word in os.getenv('FILTERED_WORDS', '').split(',') 
         if word.strip()
     ]
+    FILTER_FUZZY = os.getenv('FILTER_FUZZY', 'false').lower() == 'true'  # also catch misspelled filtered words
+    FILTER_FUZZY_MAX_DISTANCE = int(os.getenv('FILTER_FUZZY_MAX_DISTANCE', '1'))  # default edits allowed per word
+    FILTER_FUZZY_MIN_LENGTH = int(os.getenv('FILTER_FUZZY_MIN_LENGTH', '6'))  # shorter words only match exactly
     
     # Admin role names that can use admin commands
     ADMIN_ROLES = [
@@ -36,8 +99,72 @@ class BotConfig:
     
     # Rate limiting
     AI_COOLDOWN = int(os.getenv('AI_COOLDOWN', '3'))  # seconds between AI requests per user
+    AI_BURST = int(os.getenv('AI_BURST', '1'))  # AI requests a user may make back to back
     COMMAND_COOLDOWN = int(os.getenv('COMMAND_COOLDOWN', '1'))  # seconds between commands per user
     
+    # Streaming AI responses
+    AI_STREAMING = os.getenv('AI_STREAMING', 'true').lower() == 'true'
+    AI_STREAM_EDIT_INTERVAL = float(os.getenv('AI_STREAM_EDIT_INTERVAL', '1.2'))  # seconds between message edits
+    
+    # Conversation memory
+    AI_CONTEXT_WINDOW = int(os.getenv('AI_CONTEXT_WINDOW', '8192'))  # model context window in tokens
+    AI_HISTORY_TOKEN_BUDGET = int(os.getenv('AI_HISTORY_TOKEN_BUDGET', '2000'))  # max tokens of earlier turns
+    AI_HISTORY_TURNS = int(os.getenv('AI_HISTORY_TURNS', '20'))  # messages kept per conversation
+    AI_MAX_CONVERSATIONS = int(os.getenv('AI_MAX_CONVERSATIONS', '500'))
+    
+    # Per-channel message buffer (fed from gateway events, no REST history fetches)
+    AI_CHANNEL_BUFFER_SIZE = int(os.getenv('AI_CHANNEL_BUFFER_SIZE', '500'))  # messages kept per channel
+    AI_CHANNEL_BUFFER_CHANNELS = int(os.getenv('AI_CHANNEL_BUFFER_CHANNELS', '200'))  # channels kept
+    AI_CHANNEL_BUFFER_IDLE = float(os.getenv('AI_CHANNEL_BUFFER_IDLE', '3600'))  # seconds before an idle channel is dropped
+    AI_CHANNEL_CONTEXT_MESSAGES = int(os.getenv('AI_CHANNEL_CONTEXT_MESSAGES', '0'))  # recent messages sent with mentions (0 = off)
+    AI_CHANNEL_CONTEXT_TOKENS = int(os.getenv('AI_CHANNEL_CONTEXT_TOKENS', '800'))
+    
+    # /translate language detection
+    AI_TRANSLATE_MIN_CONFIDENCE = float(os.getenv('AI_TRANSLATE_MIN_CONFIDENCE', '0.3'))  # below this the source is unknown
+    
+    # Long text summarization
+    AI_SUMMARY_CHUNK_CHARS = int(os.getenv('AI_SUMMARY_CHUNK_CHARS', '6000'))  # characters per map chunk
+    AI_SUMMARY_PARALLELISM = int(os.getenv('AI_SUMMARY_PARALLELISM', '4'))  # chunks summarized at once
+    AI_SUMMARY_MAX_FILE_BYTES = int(os.getenv('AI_SUMMARY_MAX_FILE_BYTES', str(512 * 1024)))
+    AI_EXTRACTIVE_SENTENCES = int(os.getenv('AI_EXTRACTIVE_SENTENCES', '5'))  # sentences in an offline summary
+    
+    # AI response cache (only deterministic modes are cached)
+    AI_CACHE_MODES = [
+        mode.strip() for mode in os.getenv('AI_CACHE_MODES', 'translate,summarize,codegen').split(',')
+        if mode.strip()
+    ]
+    AI_CACHE_TTL = float(os.getenv('AI_CACHE_TTL', '3600'))  # seconds
+    AI_CACHE_MAX_ENTRIES = int(os.getenv('AI_CACHE_MAX_ENTRIES', '1000'))
+    AI_CACHE_MAX_BYTES = int(os.getenv('AI_CACHE_MAX_BYTES', str(4 * 1024 * 1024)))
+    
+    # Near-duplicate prompt cache (only for prompts without conversation history)
+    AI_SEMANTIC_CACHE_MODES = [
+        mode.strip() for mode in os.getenv('AI_SEMANTIC_CACHE_MODES', 'mention').split(',')
+        if mode.strip()
+    ]
+    AI_SEMANTIC_THRESHOLD = float(os.getenv('AI_SEMANTIC_THRESHOLD', '0.9'))  # cosine similarity for a hit
+    AI_SEMANTIC_MAX_ENTRIES = int(os.getenv('AI_SEMANTIC_MAX_ENTRIES', '500'))
+    AI_SEMANTIC_TTL = float(os.getenv('AI_SEMANTIC_TTL', '1800'))  # seconds
+    
+    # AI token usage metering and daily quotas (0 = unlimited)
+    AI_USAGE_DB = os.getenv('AI_USAGE_DB', 'ai_usage.db')  # SQLite file
+    AI_USAGE_FLUSH_INTERVAL = float(os.getenv('AI_USAGE_FLUSH_INTERVAL', '60'))  # seconds
+    AI_GUILD_DAILY_TOKENS = int(os.getenv('AI_GUILD_DAILY_TOKENS', '0'))
+    AI_USER_DAILY_TOKENS = int(os.getenv('AI_USER_DAILY_TOKENS', '0'))
+    
+    # AI request scheduling
+    AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', '8'))  # upstream requests in flight
+    AI_MAX_QUEUE = int(os.getenv('AI_MAX_QUEUE', '100'))  # waiting requests across all guilds
+    AI_MAX_GUILD_QUEUE = int(os.getenv('AI_MAX_GUILD_QUEUE', '20'))  # waiting requests per guild
+    # Relative queue share per guild, e.g. "123456789:2,987654321:0.5" (default weight 1)
+    AI_GUILD_WEIGHTS = {
+        int(guild_id): float(weight)
+        for guild_id, weight in (
+            entry.strip().split(':', 1) for entry in os.getenv('AI_GUILD_WEIGHTS', '').split(',')
+            if ':' in entry
+        )
+    }
+    
     @classmethod
     def get_ai_system_prompt(cls) -> str:
         """Get the system prompt for AI conversations"""
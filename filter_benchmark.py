@@ -0,0 +1,296 @@
+"""Benchmark MessageFilter against the previous implementation
+
+The previous contains_filtered_words lowercased and split the message, then
+ran one substring scan per filtered word. The current one scans the message
+once with an Aho-Corasick automaton.
+
+The second part compares the per-message work of both listeners: before,
+moderation and the AI cog each scanned for filtered words and every check
+(caps, repeats, spam) re-walked the message; now one analysis per message id
+is computed once and shared.
+
+The last part disguises the filtered words in hit messages (leetspeak,
+look-alike letters, zero-width characters, spacing) and counts how many
+each version still catches, along with what normalization costs. It also
+checks that plain numbers, prices, versions and links whose digits spell a
+filtered word in leetspeak are not flagged.
+
+Finally fuzzy matching is measured on its own: a deletion index over
+--fuzzy-terms words looks up every word of messages where some words are
+one edit away from a term, against comparing each word with every term.
+It reports how many misspellings are caught and how many messages without
+one are flagged, and checks that ordinary words a letter away from a short
+filtered word are not flagged while misspellings of it are.
+
+Usage:
+    python filter_benchmark.py --terms 5000 --messages 2000
+"""
+
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from types import SimpleNamespace
+
+PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+PARSER.add_argument('--terms', type=int, default=5000, help="filtered words in the blocklist")
+PARSER.add_argument('--messages', type=int, default=2000, help="messages to scan")
+PARSER.add_argument('--words-per-message', type=int, default=20)
+PARSER.add_argument('--hit-rate', type=float, default=0.05, help="fraction of messages containing a term")
+PARSER.add_argument('--fuzzy-terms', type=int, default=10000, help="blocklist size for the fuzzy benchmark")
+PARSER.add_argument('--fuzzy-distance', type=int, default=1, help="FILTER_FUZZY_MAX_DISTANCE for the fuzzy benchmark")
+PARSER.add_argument('--seed', type=int, default=1)
+ARGS = PARSER.parse_args()
+
+from utils.filters import MessageFilter
+from utils.fuzzy_match import FuzzyMatcher, edit_distance
+from utils.text_normalization import normalize
+
+DISGUISES = [
+    lambda term: term.replace('a', '4').replace('e', '3').replace('o', '0').replace('i', '1'),
+    lambda term: term.replace('a', '\u0430').replace('o', '\u043e').replace('e', '\u0435'),
+    lambda term: '\u200b'.join(term),
+    lambda term: ' '.join(term),
+    lambda term: '.'.join(term),
+]
+
+# Filtered words made only of letters leetspeak has digits for, and ways
+# those digits show up in ordinary messages
+NUMBER_TERMS = ['toast', 'boat', 'gate', 'seat']
+DIGITS = str.maketrans('oieastbg', '01345789')
+NUMBER_TEMPLATES = [
+    lambda digits: f"I scored {digits} points",
+    lambda digits: f"price: {digits[:-2]}.{digits[-2:]} USD",
+    lambda digits: '.'.join(digits),
+    lambda digits: f"call {digits[:2]}-{digits[2:]}",
+    lambda digits: f"see https://x.com/a{digits}",
+]
+
+# Short filtered words, ordinary words one substituted letter (or a suffix)
+# away from them, and misspellings of them that should still be caught
+FUZZY_TERMS = ['butter', 'master', 'candle']
+FUZZY_ORDINARY = ['better', 'gutter', 'putter', 'faster', 'mister', 'muster', 'handle', 'candid', 'cradle']
+FUZZY_MISSPELLINGS = ['buttter', 'btuter', 'buter', 'maaster', 'mastr', 'cnadle', 'candlle']
+
+def legacy_contains_filtered_words(filtered_words, message: str) -> bool:
+    """contains_filtered_words as it was before the automaton"""
+    if not filtered_words:
+        return False
+    message_lower = message.lower()
+    cleaned_message = re.sub(r'[^\w\s]', ' ', message_lower)
+    for word in cleaned_message.split():
+        if word in filtered_words:
+            return True
+    for filtered_word in filtered_words:
+        if filtered_word in message_lower:
+            return True
+    return False
+
+def legacy_filter_reasons(filtered_words, message_filter, message: str) -> list:
+    """get_filter_reason as it was before MessageAnalysis"""
+    def is_excessive_caps():
+        if len(message) < 10:
+            return False
+        letters = [c for c in message if c.isalpha()]
+        if len(letters) < 5:
+            return False
+        return sum(1 for c in letters if c.isupper()) / len(letters) > message_filter.caps_threshold
+
+    def has_excessive_repeats():
+        return bool(message_filter.repeat_pattern.search(message))
+
+    def is_spam_like():
+        spam_indicators = is_excessive_caps() + has_excessive_repeats()
+        spam_indicators += len(message.split()) < 3 and len(message) > 50
+        emoji_count = len(re.findall(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]', message))
+        spam_indicators += emoji_count > 5
+        return spam_indicators >= 2
+
+    reasons = []
+    if legacy_contains_filtered_words(filtered_words, message):
+        reasons.append("Contains inappropriate content")
+    if message_filter.contains_discord_invite(message):
+        reasons.append("Contains Discord invite link")
+    if is_excessive_caps():
+        reasons.append("Excessive capital letters")
+    if has_excessive_repeats():
+        reasons.append("Excessive repeated characters")
+    if is_spam_like():
+        reasons.append("Appears to be spam")
+    return reasons
+
+def random_word(rng: random.Random, low: int, high: int) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(low, high)))
+
+def misspell(rng: random.Random, term: str) -> str:
+    """term with one random insertion, deletion, substitution or transposition"""
+    position = rng.randrange(len(term) - 1)
+    letter = rng.choice(string.ascii_lowercase)
+    return rng.choice([
+        term[:position] + letter + term[position:],
+        term[:position] + term[position + 1:],
+        term[:position] + letter + term[position + 1:],
+        term[:position] + term[position + 1] + term[position] + term[position + 2:],
+    ])
+
+def fuzzy_benchmark(rng: random.Random):
+    terms = sorted({random_word(rng, 5, 12) for _ in range(ARGS.fuzzy_terms)})
+    fuzzy = FuzzyMatcher(max_distance=ARGS.fuzzy_distance)
+    started = time.perf_counter()
+    for term in terms:
+        fuzzy.add(term)
+    build = time.perf_counter() - started
+
+    messages = []
+    planted = []
+    for _ in range(ARGS.messages):
+        words = [random_word(rng, 2, 7) for _ in range(ARGS.words_per_message)]
+        planted.append(rng.random() < ARGS.hit_rate)
+        if planted[-1]:
+            words[rng.randrange(len(words))] = misspell(rng, rng.choice(terms))
+        messages.append(words)
+
+    started = time.perf_counter()
+    flagged = [any(fuzzy.lookup(word) for word in words) for words in messages]
+    indexed_time = time.perf_counter() - started
+    caught = sum(hit and misspelled for hit, misspelled in zip(flagged, planted))
+    false_positives = sum(hit and not misspelled for hit, misspelled in zip(flagged, planted))
+
+    # Comparing every word with every term is far too slow for all messages
+    sample = messages[:max(1, len(messages) // 200)]
+    started = time.perf_counter()
+    for words in sample:
+        for word in words:
+            for term in terms:
+                distance = fuzzy.default_distance(term)
+                edit_distance(word, term, distance) <= distance
+    brute_time = (time.perf_counter() - started) / len(sample) * len(messages)
+
+    print(f"fuzzy terms={len(terms)} index build: {build * 1000:.1f}ms")
+    print(f"misspelled terms caught: {caught}/{sum(planted)}, "
+          f"false positives: {false_positives}/{len(messages) - sum(planted)} messages")
+    print(f"fuzzy brute force: {brute_time / len(messages) * 1e6:8.1f}us/message (sampled)")
+    print(f"fuzzy index:       {indexed_time / len(messages) * 1e6:8.1f}us/message, "
+          f"{len(messages) / indexed_time:.0f} messages/s")
+    print(f"speedup: {brute_time / indexed_time:.1f}x")
+
+    short = FuzzyMatcher(max_distance=ARGS.fuzzy_distance)
+    for term in FUZZY_TERMS:
+        short.add(term)
+    ordinary = [word for word in FUZZY_ORDINARY if short.lookup(word)]
+    if ordinary:
+        print(f"FALSE POSITIVES: {len(ordinary)} ordinary words flagged, e.g. {ordinary[0]!r}")
+        sys.exit(1)
+    missed = [word for word in FUZZY_MISSPELLINGS if not short.lookup(word)]
+    print(f"ordinary words flagged: 0/{len(FUZZY_ORDINARY)}, "
+          f"misspellings caught: {len(FUZZY_MISSPELLINGS) - len(missed)}/{len(FUZZY_MISSPELLINGS)}")
+
+def main():
+    rng = random.Random(ARGS.seed)
+    terms = {random_word(rng, 6, 12) for _ in range(ARGS.terms)}
+    term_list = sorted(terms)
+
+    messages = []
+    for _ in range(ARGS.messages):
+        words = [random_word(rng, 2, 7) for _ in range(ARGS.words_per_message)]
+        if rng.random() < ARGS.hit_rate:
+            words[rng.randrange(len(words))] = rng.choice(term_list).upper()
+        messages.append(' '.join(words) + rng.choice(['.', '!', '?', '']))
+
+    message_filter = MessageFilter()
+    started = time.perf_counter()
+    for term in term_list:
+        message_filter.add_filtered_word(term)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    legacy = [legacy_contains_filtered_words(terms, message) for message in messages]
+    legacy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    current = [message_filter.contains_filtered_words(message) for message in messages]
+    current_time = time.perf_counter() - started
+
+    if legacy != current:
+        mismatches = sum(1 for old, new in zip(legacy, current) if old != new)
+        print(f"MISMATCH: {mismatches} messages disagree with the legacy implementation")
+        sys.exit(1)
+
+    print(f"terms={len(terms)} messages={len(messages)} hits={sum(current)}")
+    print(f"automaton build: {build * 1000:.1f}ms")
+
+    # Live edits to the blocklist, each followed by a scan as on a busy server
+    extra = sorted({random_word(rng, 6, 12) for _ in range(200)} - terms)
+    started = time.perf_counter()
+    for term in extra:
+        message_filter.add_filtered_word(term)
+        message_filter.contains_filtered_words(messages[0])
+    for term in extra:
+        message_filter.remove_filtered_word(term)
+        message_filter.contains_filtered_words(messages[0])
+    edit_time = time.perf_counter() - started
+    print(f"add or remove and scan: {edit_time / (2 * len(extra)) * 1e6:8.1f}us/edit")
+    print(f"legacy:     {legacy_time * 1000:8.1f}ms total, {legacy_time / len(messages) * 1e6:8.1f}us/message")
+    print(f"automaton:  {current_time * 1000:8.1f}ms total, {current_time / len(messages) * 1e6:8.1f}us/message")
+    print(f"speedup: {legacy_time / current_time:.1f}x")
+
+    # Per-message pipeline: moderation scans the message, the AI cog scans it
+    # again, and a reason lookup runs every check
+    events = [SimpleNamespace(id=index, content=message) for index, message in enumerate(messages)]
+
+    started = time.perf_counter()
+    legacy = []
+    for event in events:
+        legacy_contains_filtered_words(terms, event.content)
+        legacy_contains_filtered_words(terms, event.content)
+        legacy.append(legacy_filter_reasons(terms, message_filter, event.content))
+    legacy_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    current = []
+    for event in events:
+        message_filter.analyze_message(event).filtered_match
+        message_filter.analyze_message(event).filtered_match
+        current.append(message_filter.analyze_message(event).filter_reasons)
+    current_time = time.perf_counter() - started
+
+    if legacy != current:
+        mismatches = sum(1 for old, new in zip(legacy, current) if old != new)
+        print(f"MISMATCH: {mismatches} messages get different filter reasons")
+        sys.exit(1)
+
+    print(f"legacy pipeline:  {legacy_time / len(messages) * 1e6:8.1f}us/message")
+    print(f"shared analysis:  {current_time / len(messages) * 1e6:8.1f}us/message")
+    print(f"speedup: {legacy_time / current_time:.1f}x")
+
+    disguised = []
+    for _ in range(ARGS.messages):
+        words = [random_word(rng, 2, 7) for _ in range(ARGS.words_per_message)]
+        words[rng.randrange(len(words))] = rng.choice(DISGUISES)(rng.choice(term_list))
+        disguised.append(' '.join(words))
+
+    legacy_hits = sum(legacy_contains_filtered_words(terms, message) for message in disguised)
+    current_hits = sum(message_filter.contains_filtered_words(message) for message in disguised)
+    started = time.perf_counter()
+    for message in messages:
+        normalize(message)
+    normalize_time = time.perf_counter() - started
+
+    print(f"disguised terms caught: legacy {legacy_hits}/{len(disguised)}, normalized {current_hits}/{len(disguised)}")
+
+    for term in NUMBER_TERMS:
+        message_filter.add_filtered_word(term)
+    numbers = [template(term.translate(DIGITS)) for term in NUMBER_TERMS for template in NUMBER_TEMPLATES]
+    flagged = [message for message in numbers if message_filter.contains_filtered_words(message)]
+    if flagged:
+        print(f"FALSE POSITIVES: {len(flagged)} plain numbers flagged, e.g. {flagged[0]!r}")
+        sys.exit(1)
+    print(f"plain numbers flagged: 0/{len(numbers)}")
+    print(f"normalization:    {normalize_time / len(messages) * 1e6:8.1f}us/message")
+
+    fuzzy_benchmark(rng)
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,83 @@
 import re
-from typing import List, Set
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 from config import BotConfig
+from utils.aho_corasick import AhoCorasick, Match
+from utils.fuzzy_match import FuzzyMatcher
+from utils.text_normalization import normalize, normalize_with_offsets, original_span
+
+CAPS_THRESHOLD = 0.7  # 70% uppercase letters
+
+WORD_PATTERN = re.compile(r'\w+')
+
+EMOJI_PATTERN = re.compile(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]')
+
+class MessageAnalysis(NamedTuple):
+    """Everything the filters need to know about one message, computed once"""
+    length: int
+    word_count: int
+    letter_count: int
+    caps_ratio: float  # uppercase share of letters
+    has_repeats: bool  # 5 or more of one character in a row
+    emoji_count: int
+    has_invite: bool
+    has_url: bool
+    filtered_match: Optional[Match]
+    
+    @property
+    def is_excessive_caps(self) -> bool:
+        # Skip short messages and ones with too few letters to judge
+        return self.length >= 10 and self.letter_count >= 5 and self.caps_ratio > CAPS_THRESHOLD
+    
+    @property
+    def has_excessive_repeats(self) -> bool:
+        return self.has_repeats
+    
+    @property
+    def is_spam_like(self) -> bool:
+        spam_indicators = sum((
+            self.is_excessive_caps,
+            self.has_excessive_repeats,
+            self.word_count < 3 and self.length > 50,  # Long message with few words
+            self.emoji_count > 5
+        ))
+        return spam_indicators >= 2
+    
+    @property
+    def filter_reasons(self) -> List[str]:
+        """Reasons this message would be filtered"""
+        reasons = []
+        if self.filtered_match:
+            reasons.append("Contains inappropriate content")
+        if self.has_invite:
+            reasons.append("Contains Discord invite link")
+        if self.is_excessive_caps:
+            reasons.append("Excessive capital letters")
+        if self.has_excessive_repeats:
+            reasons.append("Excessive repeated characters")
+        if self.is_spam_like:
+            reasons.append("Appears to be spam")
+        return reasons
 
 class MessageFilter:
     """Message filtering and content moderation utilities"""
     
     def __init__(self):
-        # Load filtered words from config
+        # One automaton scan finds any filtered word, however many there are.
+        # It holds normalized terms; several filtered words may share one.
         self.filtered_words: Set[str] = set()
-        for word in BotConfig.FILTERED_WORDS:
-            self.filtered_words.add(word.lower())
+        self.matcher = AhoCorasick()
+        self._normalized_terms: Dict[str, Set[str]] = {}
+        
+        # Misspelled filtered words are looked up word by word in a deletion index
+        self.fuzzy: Optional[FuzzyMatcher] = None
+        if BotConfig.FILTER_FUZZY:
+            self.fuzzy = FuzzyMatcher(BotConfig.FILTER_FUZZY_MAX_DISTANCE, BotConfig.FILTER_FUZZY_MIN_LENGTH)
+        
+        # Load filtered words from config, with optional "~N" edit distances
+        for entry in BotConfig.FILTERED_WORDS:
+            word, _, distance = entry.partition('~')
+            self.add_filtered_word(word, int(distance) if distance.isdigit() else None)
         
         # Common patterns to detect
         self.url_pattern = re.compile(
@@ -21,36 +89,84 @@ class MessageFilter:
         )
         
         # Excessive caps detection
-        self.caps_threshold = 0.7  # 70% uppercase letters
+        self.caps_threshold = CAPS_THRESHOLD
         
         # Excessive repeated characters
         self.repeat_pattern = re.compile(r'(.)\1{4,}')  # 5 or more repeated characters
+        
+        # Analyses of recent messages by message id, shared by every listener
+        self._analyses: "OrderedDict[int, Tuple[str, MessageAnalysis]]" = OrderedDict()
+        self.max_cached_analyses = 1024
+    
+    def analyze(self, message: str) -> MessageAnalysis:
+        """Compute every filter feature of a message at once
+        
+        Each feature is counted by a C-level primitive (str methods, compiled
+        regexes, the automaton) rather than a Python loop over characters.
+        """
+        letters = sum(map(str.isalpha, message))
+        uppers = sum(map(str.isupper, filter(str.isalpha, message))) if letters else 0
+        
+        return MessageAnalysis(
+            length=len(message),
+            word_count=len(message.split()),
+            letter_count=letters,
+            caps_ratio=uppers / letters if letters else 0.0,
+            has_repeats=bool(self.repeat_pattern.search(message)),
+            emoji_count=len(EMOJI_PATTERN.findall(message)),
+            has_invite=bool(self.invite_pattern.search(message)),
+            has_url=bool(self.url_pattern.search(message)),
+            filtered_match=self.find_filtered_word(message)
+        )
+    
+    def analyze_message(self, message) -> MessageAnalysis:
+        """Analysis of a discord.Message, cached by id so each message is only analyzed once"""
+        cached = self._analyses.get(message.id)
+        # An edited message keeps its id, so the content has to match too
+        if cached is not None and cached[0] == message.content:
+            self._analyses.move_to_end(message.id)
+            return cached[1]
+        
+        analysis = self.analyze(message.content)
+        self._analyses[message.id] = (message.content, analysis)
+        self._analyses.move_to_end(message.id)
+        while len(self._analyses) > self.max_cached_analyses:
+            self._analyses.popitem(last=False)
+        return analysis
+    
+    def find_filtered_word(self, message: str) -> Optional[Match]:
+        """Find the first filtered word in message
+        
+        Message and filtered words are both normalized first, so case, accents,
+        look-alike characters, leetspeak, invisible characters and spaced-out
+        letters don't hide a match, and filtered words inside longer words are
+        caught. With fuzzy matching on, words a few edits away from a filtered
+        word are caught too. Returns the filtered word and its span in message,
+        or None.
+        """
+        normalized = normalize(message)
+        found = self.matcher.search(normalized)
+        if found is None and self.fuzzy is not None:
+            found = self._find_fuzzy(normalized)
+        if found is None:
+            return None
+        
+        # Only a hit needs the slower pass that tracks original offsets
+        _, offsets = normalize_with_offsets(message)
+        start, end = original_span(offsets, found.start, found.end)
+        return Match(min(self._normalized_terms[found.term]), start, end)
+    
+    def _find_fuzzy(self, normalized: str) -> Optional[Match]:
+        """First word of normalized text within its edit distance of a filtered word"""
+        for word in WORD_PATTERN.finditer(normalized):
+            hit = self.fuzzy.lookup(word.group())
+            if hit is not None:
+                return Match(hit[0], word.start(), word.end())
+        return None
     
     def contains_filtered_words(self, message: str) -> bool:
         """Check if message contains filtered words"""
-        if not self.filtered_words:
-            return False
-        
-        # Convert to lowercase for checking
-        message_lower = message.lower()
-        
-        # Remove common punctuation for better detection
-        cleaned_message = re.sub(r'[^\w\s]', ' ', message_lower)
-        
-        # Split into words
-        words = cleaned_message.split()
-        
-        # Check each word
-        for word in words:
-            if word in self.filtered_words:
-                return True
-        
-        # Check for partial matches in filtered words
-        for filtered_word in self.filtered_words:
-            if filtered_word in message_lower:
-                return True
-        
-        return False
+        return self.find_filtered_word(message) is not None
     
     def contains_discord_invite(self, message: str) -> bool:
         """Check if message contains Discord invite links"""
@@ -81,45 +197,11 @@ class MessageFilter:
     
     def is_spam_like(self, message: str) -> bool:
         """Check if message appears to be spam-like"""
-        # Check multiple spam indicators
-        spam_indicators = 0
-        
-        if self.is_excessive_caps(message):
-            spam_indicators += 1
-        
-        if self.has_excessive_repeats(message):
-            spam_indicators += 1
-        
-        if len(message.split()) < 3 and len(message) > 50:  # Long message with few words
-            spam_indicators += 1
-        
-        # Check for excessive emojis
-        emoji_count = len(re.findall(r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]', message))
-        if emoji_count > 5:
-            spam_indicators += 1
-        
-        return spam_indicators >= 2
+        return self.analyze(message).is_spam_like
     
     def get_filter_reason(self, message: str) -> List[str]:
         """Get list of reasons why message was filtered"""
-        reasons = []
-        
-        if self.contains_filtered_words(message):
-            reasons.append("Contains inappropriate content")
-        
-        if self.contains_discord_invite(message):
-            reasons.append("Contains Discord invite link")
-        
-        if self.is_excessive_caps(message):
-            reasons.append("Excessive capital letters")
-        
-        if self.has_excessive_repeats(message):
-            reasons.append("Excessive repeated characters")
-        
-        if self.is_spam_like(message):
-            reasons.append("Appears to be spam")
-        
-        return reasons
+        return self.analyze(message).filter_reasons
     
     def clean_message(self, message: str) -> str:
         """Clean message by removing filtered content"""
@@ -131,13 +213,33 @@ class MessageFilter:
         
         return cleaned
     
-    def add_filtered_word(self, word: str):
-        """Add a word to the filter list"""
-        self.filtered_words.add(word.lower())
+    def add_filtered_word(self, word: str, max_distance: Optional[int] = None):
+        """Add a word to the filter list
+        
+        max_distance overrides how many edits fuzzy matching allows for it.
+        """
+        word = word.lower()
+        self.filtered_words.add(word)
+        term = normalize(word)
+        if term:
+            self._normalized_terms.setdefault(term, set()).add(word)
+            self.matcher.add(term)
+            if self.fuzzy is not None and ' ' not in term:
+                self.fuzzy.add(term, max_distance)
     
     def remove_filtered_word(self, word: str):
         """Remove a word from the filter list"""
-        self.filtered_words.discard(word.lower())
+        word = word.lower()
+        self.filtered_words.discard(word)
+        term = normalize(word)
+        words = self._normalized_terms.get(term)
+        if words is not None:
+            words.discard(word)
+            if not words:
+                del self._normalized_terms[term]
+                self.matcher.remove(term)
+                if self.fuzzy is not None:
+                    self.fuzzy.remove(term)
     
     def get_filtered_words(self) -> List[str]:
         """Get list of currently filtered words"""
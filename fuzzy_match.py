@@ -0,0 +1,124 @@
+from collections import Counter
+from typing import Dict, Optional, Set, Tuple
+
+# Terms from this length allow two edits by default, and match through a
+# substituted letter. Swapping one letter of a shorter word mostly makes
+# another ordinary word ("batch", "pitch", "witch"), while evasions insert,
+# drop or swap letters instead.
+LONG_TERM_LENGTH = 9
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """Optimal string alignment distance (edits with adjacent transpositions)
+
+    Gives up early once the distance must exceed limit, returning limit + 1.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous_row = None
+    row = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        before, previous_row, row = previous_row, row, [i] + [0] * len(second)
+        for j, second_char in enumerate(second, 1):
+            cost = first_char != second_char
+            row[j] = min(previous_row[j] + 1, row[j - 1] + 1, previous_row[j - 1] + cost)
+            if cost and i > 1 and j > 1 and first_char == second[j - 2] and first[i - 2] == second_char:
+                row[j] = min(row[j], before[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+    return min(row[-1], limit + 1)
+
+def is_substitution(first: str, second: str) -> bool:
+    """Whether two strings differ in exactly one letter, at the same position"""
+    return len(first) == len(second) and sum(a != b for a, b in zip(first, second)) == 1
+
+def deletions(word: str, distance: int) -> Set[str]:
+    """word and every string made by deleting up to distance characters from it"""
+    found = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        found |= frontier
+    return found
+
+class FuzzyMatcher:
+    """SymSpell-style deletion index for finding terms within a few edits of a word
+
+    Every term is indexed under each string reachable by deleting up to its
+    maximum edit distance of characters. Two words within d edits of each
+    other share such a deletion, so a lookup only generates the word's own
+    deletions and verifies the few terms they hit, however many terms there
+    are. Words whose length no term could reach are skipped outright, and
+    words only short terms can reach get only single deletions. A word one
+    substituted letter away from a term shorter than LONG_TERM_LENGTH is not
+    a match.
+    """
+
+    def __init__(self, max_distance: int = 1, min_length: int = 6):
+        self.max_distance = max_distance
+        self.min_length = min_length  # shorter terms are only matched exactly
+        self._index: Dict[str, Set[str]] = {}
+        self._distances: Dict[str, int] = {}
+        # Per edit distance, how many terms allowing it can match a word of each length
+        self._reach: Dict[int, Counter] = {}
+
+    def default_distance(self, term: str) -> int:
+        """Edits allowed for a term by default: none when short, two from LONG_TERM_LENGTH characters"""
+        if len(term) < self.min_length:
+            return 0
+        return min(self.max_distance, 1 if len(term) < LONG_TERM_LENGTH else 2)
+
+    def add(self, term: str, max_distance: Optional[int] = None) -> bool:
+        """Index a term, returning False if it allows no edits or is already indexed"""
+        distance = self.default_distance(term) if max_distance is None else min(max_distance, len(term) - 1)
+        if distance <= 0 or term in self._distances:
+            return False
+        self._distances[term] = distance
+        for variant in deletions(term, distance):
+            self._index.setdefault(variant, set()).add(term)
+        self._reach.setdefault(distance, Counter()).update(range(len(term) - distance, len(term) + distance + 1))
+        return True
+
+    def remove(self, term: str) -> bool:
+        """Drop a term from the index, returning False if it was not indexed"""
+        distance = self._distances.pop(term, None)
+        if distance is None:
+            return False
+        for variant in deletions(term, distance):
+            terms = self._index[variant]
+            terms.discard(term)
+            if not terms:
+                del self._index[variant]
+        lengths = self._reach[distance]
+        lengths.subtract(range(len(term) - distance, len(term) + distance + 1))
+        lengths += Counter()  # drop lengths no term can match any more
+        if not lengths:
+            del self._reach[distance]
+        return True
+
+    def lookup(self, word: str) -> Optional[Tuple[str, int]]:
+        """The indexed term closest to word and its edit distance, or None if none is within reach"""
+        # Only generate as many deletions as the terms within reach of this length allow
+        widest = max((distance for distance, lengths in self._reach.items() if lengths[len(word)]), default=0)
+        if not widest:
+            return None
+        best = None
+        best_distance = widest + 1
+        seen = set()
+        for variant in deletions(word, widest):
+            for term in self._index.get(variant, ()):
+                if term in seen:
+                    continue
+                seen.add(term)
+                if len(term) < LONG_TERM_LENGTH and is_substitution(word, term):
+                    continue
+                limit = min(self._distances[term], best_distance - 1)
+                distance = edit_distance(word, term, limit)
+                if distance <= limit:
+                    best, best_distance = term, distance
+        return (best, best_distance) if best is not None else None
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._distances
+
+    def __len__(self) -> int:
+        return len(self._distances)
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import AsyncIterator, Optional
+
+from config import BotConfig
+
+class HedgedOpenRouterClient:
+    """Client wrapper that hedges slow requests with a second one
+
+    If the primary request has not produced its first byte by the configured
+    percentile of recent first-byte latencies, a hedge request is sent to an
+    alternate model. The first good answer wins and the other is cancelled.
+    Non-streamed requests count the whole response as the first byte.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.logger = logging.getLogger('openrouter')
+        self.latencies = deque(maxlen=BotConfig.AI_HEDGE_WINDOW)
+
+        # Metrics
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """Fraction of requests that sent a hedge"""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of hedges that answered first"""
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary before hedging"""
+        if len(self.latencies) < BotConfig.AI_HEDGE_MIN_SAMPLES:
+            return BotConfig.AI_HEDGE_DELAY
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * BotConfig.AI_HEDGE_PERCENTILE / 100))
+        return max(BotConfig.AI_HEDGE_MIN_DELAY, ordered[index])
+
+    def hedge_model(self, primary: Optional[str]) -> str:
+        """Model the hedge request goes to"""
+        if BotConfig.AI_HEDGE_MODEL:
+            return BotConfig.AI_HEDGE_MODEL
+        if BotConfig.OPENROUTER_FALLBACK_MODELS:
+            return BotConfig.OPENROUTER_FALLBACK_MODELS[0]
+        # Same model again, OpenRouter may route it to another provider
+        return primary or BotConfig.OPENROUTER_MODEL
+
+    def available(self) -> bool:
+        """Whether the wrapped client would accept a call right now"""
+        return self.client.available()
+
+    async def chat_completion(self, messages, model: Optional[str] = None, **kwargs) -> dict:
+        """Chat completion, hedged when the primary is slow"""
+        if not BotConfig.AI_HEDGING:
+            return await self.client.chat_completion(messages, model=model, **kwargs)
+
+        self.requests += 1
+        started = time.monotonic()
+        primary = asyncio.ensure_future(self.client.chat_completion(messages, model=model, **kwargs))
+        pending = {primary}
+
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.hedge_delay())
+            if not done:
+                self.hedged += 1
+                hedge_model = self.hedge_model(model)
+                self.logger.info(f"Hedging slow request to {hedge_model}")
+                pending.add(asyncio.ensure_future(
+                    self.client.chat_completion(messages, model=hedge_model, **kwargs)
+                ))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.latencies.append(time.monotonic() - started)
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream_chat_completion(self, messages, model: Optional[str] = None,
+                                     **kwargs) -> AsyncIterator[str]:
+        """Streamed chat completion, hedged when the first token is slow"""
+        if not BotConfig.AI_HEDGING:
+            async for delta in self.client.stream_chat_completion(messages, model=model, **kwargs):
+                yield delta
+            return
+
+        self.requests += 1
+        started = time.monotonic()
+        primary = self.client.stream_chat_completion(messages, model=model, **kwargs)
+        # Each candidate stream is raced on its first chunk
+        firsts = {asyncio.ensure_future(primary.__anext__()): primary}
+        winner = None
+        first_chunk = None
+
+        try:
+            done, _ = await asyncio.wait(firsts, timeout=self.hedge_delay())
+            if not done:
+                self.hedged += 1
+                hedge_model = self.hedge_model(model)
+                self.logger.info(f"Hedging slow stream to {hedge_model}")
+                hedge = self.client.stream_chat_completion(messages, model=hedge_model, **kwargs)
+                firsts[asyncio.ensure_future(hedge.__anext__())] = hedge
+
+            pending = set(firsts)
+            error = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    exception = task.exception()
+                    if exception is None or isinstance(exception, StopAsyncIteration):
+                        winner = firsts[task]
+                        first_chunk = None if exception else task.result()
+                        break
+                    error = error or exception
+            if winner is None:
+                raise error
+        finally:
+            for task, stream in firsts.items():
+                if winner is not stream:
+                    task.cancel()
+                    # Let the cancellation unwind before closing the generator
+                    await asyncio.gather(task, return_exceptions=True)
+                    await stream.aclose()
+
+        self.latencies.append(time.monotonic() - started)
+        if winner is not primary:
+            self.hedge_wins += 1
+
+        try:
+            if first_chunk is None:
+                return
+            yield first_chunk
+            async for delta in winner:
+                yield delta
+        finally:
+            await winner.aclose()
@@ -0,0 +1,145 @@
+import re
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+# Most frequent character trigrams per language, most frequent first.
+# Word boundaries are spaces, so " th" means "th" at the start of a word.
+TRIGRAM_PROFILES_RAW = {
+    'en': [
+        " th", "the", "he ", " an", "and", "nd ", " to", "ing", "ng ", " of", "of ", "ed ", "to ",
+        " in", "is ", "ion", "in ", " a ", "er ", "at ", "re ", "hat", " is", "tio", "on ", "es ",
+        " wh", "ent", "for", " fo", " it", "or ", "tha", " be", "it ", "you", " yo", "ou ", "her",
+        "ly ", "ere", "ter", "all", " wa", "was", "ith", "wit", " wi", " ha", "ve ", "hav", "ks ",
+    ],
+    'es': [
+        " de", "de ", " la", "la ", "os ", " qu", "que", "ue ", " el", "el ", "es ", " en", "en ",
+        "as ", " co", "ent", "do ", " lo", "ón ", "ció", "aci", "ion", " es", "los", " se", "er ",
+        "ar ", "ra ", "nte", "con", " po", "por", "or ", "ado", "ste", "est", " un", "una", "ara",
+        " pa", "par", "ida", "mos", "dad", "ien", "sta", "ero", " me", "más", "pue", "ías", "dia",
+    ],
+    'fr': [
+        " de", "es ", "de ", " le", "ent", "le ", "nt ", "la ", " la", "les", " et", "et ", "ion",
+        "on ", " qu", "que", "ue ", " pa", "des", " un", "re ", " co", "ait", "ne ", " po", "pou",
+        "our", " en", "ous", " il", "tio", "ans", " da", "dan", "eur", "men", " ne", "est", " je",
+        "je ", "ais", "ai ", "ur ", "une", "par", "ell", "vou", " vo", " ce", "ce ", "pas", " ma",
+        "mai", "sai", " tu", "tu ", "eux", "ire", "ça ", "là ", "oi ", "qui", "ui ",
+    ],
+    'de': [
+        "en ", "er ", " de", "der", "ch ", "ein", "ie ", "ich", "sch", "die", " di", "ten", "nd ",
+        "und", " un", "cht", " ei", "ung", "gen", "den", "es ", "in ", " ge", "ine", " da", "das",
+        "te ", "ste", " be", "ber", "nen", " zu", "zu ", "auf", " au", "ist", " is", "mit", " mi",
+        "ach", "nic", " ni", "eit", "hen", "lic", "ver", " ve", "ür ", "eiß", "iß ", " wa", "was",
+    ],
+    'pt': [
+        " de", "de ", "os ", " qu", "que", "ue ", "as ", " co", "ão ", "ção", " a ", "do ", "da ",
+        " da", " do", " se", "ent", "es ", " pa", " um", "com", "ara", "nte", " es", "est", "não",
+        " nã", "ões", "em ", " em", "ado", "uma", "mos", "por", " po", "ar ", "ade", "ela", "ele",
+        "ém ", "tam", "voc", "ocê", "mai", "ais", " ma", "sta", "eu ", "obr", "ova", "vou",
+    ],
+    'it': [
+        " di", "di ", "che", " ch", "he ", "la ", " la", "re ", "to ", " il", "il ", "ell", "del",
+        " de", "lla", "ne ", "one", "ent", " co", "no ", "ion", "per", " pe", "er ", "zio", "ato",
+        " un", "non", " no", "con", "ta ", "tto", " è ", "ame", "ere", " si", "ono", "gli", "nte",
+        "are", "ess", "sta", "ia ", "mol", "anc", " qu", "qua", "rò ", "sa ", "cos", "ci ",
+    ],
+    'nl': [
+        "en ", " de", "de ", "een", " ee", "an ", "het", " he", "et ", "van", " va", "er ", "ij ",
+        " in", "in ", "ing", "nde", "oor", " vo", "voo", "te ", "ver", " ve", "aar", " ge", "gen",
+        "eer", "dat", " da", "ijn", "sch", "zij", " zi", "iet", " ni", "nie", "ook", " oo", "met",
+        " me", "lij", "ter", "ond", "cht", "aan", " aa", "ik ", " ik", "wor", "ord", "oe ", "eet",
+    ],
+}
+
+LANGUAGE_NAMES = {
+    'en': 'English', 'es': 'Spanish', 'fr': 'French', 'de': 'German', 'pt': 'Portuguese',
+    'it': 'Italian', 'nl': 'Dutch', 'ru': 'Russian', 'ar': 'Arabic', 'he': 'Hebrew',
+    'hi': 'Hindi', 'ja': 'Japanese', 'ko': 'Korean', 'zh': 'Chinese', 'el': 'Greek', 'th': 'Thai',
+}
+
+# Non-Latin scripts identify the language (or language family) on their own
+SCRIPT_RANGES = [
+    (0x0370, 0x03FF, 'el'),
+    (0x0400, 0x04FF, 'ru'),
+    (0x0590, 0x05FF, 'he'),
+    (0x0600, 0x06FF, 'ar'),
+    (0x0900, 0x097F, 'hi'),
+    (0x0E00, 0x0E7F, 'th'),
+    (0x3040, 0x30FF, 'ja'),
+    (0x4E00, 0x9FFF, 'zh'),
+    (0xAC00, 0xD7AF, 'ko'),
+]
+
+def _build_profiles() -> Dict[str, Dict[str, float]]:
+    """Turn the ranked trigram lists into rank-weighted lookup tables"""
+    profiles = {}
+    for language, trigrams in TRIGRAM_PROFILES_RAW.items():
+        malformed = [trigram for trigram in trigrams if len(trigram) != 3]
+        if malformed:
+            raise ValueError(f"{language} profile has entries that are not trigrams: {malformed}")
+        ranked = list(dict.fromkeys(trigrams))
+        profiles[language] = {
+            trigram: 1.0 - rank / len(ranked) for rank, trigram in enumerate(ranked)
+        }
+    return profiles
+
+TRIGRAM_PROFILES = _build_profiles()
+
+NON_LETTERS = re.compile(r"[^\w]+|[\d_]+")
+
+# How much of the text the best profile has to explain before it is named:
+# the share of trigrams in the profile, and the rank-weighted score. Text in
+# a language without a profile (Tagalog, Swahili, pinyin) falls short of these,
+# however far ahead of the other profiles the best one is.
+MIN_COVERAGE = 0.2
+MIN_SCORE = 0.13
+
+def _script_language(text: str) -> Optional[str]:
+    """Language implied by the dominant non-Latin script, if any"""
+    counts = Counter()
+    letters = 0
+    for char in text:
+        if not char.isalpha():
+            continue
+        letters += 1
+        code = ord(char)
+        for start, end, language in SCRIPT_RANGES:
+            if start <= code <= end:
+                counts[language] += 1
+                break
+    if not letters or not counts:
+        return None
+
+    # Kana anywhere means Japanese even when kanji dominate
+    if counts['ja'] and counts['zh']:
+        counts['ja'] += counts.pop('zh')
+    language, count = counts.most_common(1)[0]
+    return language if count / letters > 0.5 else None
+
+def detect_language(text: str) -> Tuple[Optional[str], float]:
+    """Identify the language of text
+
+    Returns an ISO 639-1 code and a confidence between 0 and 1, or
+    (None, 0.0) when the text is too short or no profile explains enough of it.
+    The confidence is the best profile's lead over the runner-up.
+    """
+    script_language = _script_language(text)
+    if script_language:
+        return script_language, 1.0
+
+    normalized = ' ' + NON_LETTERS.sub(' ', text.lower()).strip() + ' '
+    if len(normalized) < 8:
+        return None, 0.0
+
+    trigrams = Counter(normalized[i:i + 3] for i in range(len(normalized) - 2))
+    total = sum(trigrams.values())
+    scores = {
+        language: sum(count * profile.get(trigram, 0.0) for trigram, count in trigrams.items()) / total
+        for language, profile in TRIGRAM_PROFILES.items()
+    }
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, second_score) = ranked[0], ranked[1]
+    covered = sum(count for trigram, count in trigrams.items() if trigram in TRIGRAM_PROFILES[best])
+    if best_score < MIN_SCORE or covered / total < MIN_COVERAGE:
+        return None, 0.0
+    return best, (best_score - second_score) / best_score
@@ -8,7 +8,7 @@ import logging
 
 from config import BotConfig
 from utils.permissions import is_admin, has_permission
-from utils.filters import MessageFilter
+from utils.rate_limiter import SlidingWindowLimiter
 
 class ModerationCog(commands.Cog):
     """Moderation commands and auto-moderation features"""
@@ -16,8 +16,13 @@ class ModerationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = logging.getLogger('moderation')
-        self.message_filter = MessageFilter()
-        self.user_message_counts = {}  # For spam detection
+        self.message_filter = bot.message_filter
+        # For spam detection: SPAM_THRESHOLD messages per SPAM_WINDOW seconds per
+        # guild and user, unless the guild has its own limits
+        self.spam_limiter = SlidingWindowLimiter(
+            limit=BotConfig.SPAM_THRESHOLD,
+            window=BotConfig.SPAM_WINDOW
+        )
         
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -29,8 +34,9 @@ class ModerationCog(commands.Cog):
         if await is_admin(message.author):
             return
         
-        # Check for filtered words
-        if self.message_filter.contains_filtered_words(message.content):
+        # Check for filtered words, using the analysis shared with the AI cog
+        match = self.message_filter.analyze_message(message).filtered_match
+        if match:
             await message.delete()
             
             embed = discord.Embed(
@@ -48,7 +54,10 @@ class ModerationCog(commands.Cog):
                     delete_after=10
                 )
             
-            self.logger.info(f"Filtered message from {message.author} in {message.guild.name}")
+            self.logger.info(
+                f"Filtered message from {message.author} in {message.guild.name} "
+                f"(matched '{match.term}' at {match.start}-{match.end})"
+            )
             return
         
         # Spam detection
@@ -56,27 +65,17 @@ class ModerationCog(commands.Cog):
     
     async def _check_spam(self, message):
         """Check for spam and take action"""
-        user_id = message.author.id
-        now = datetime.now()
-        
-        # Initialize or update user message count
-        if user_id not in self.user_message_counts:
-            self.user_message_counts[user_id] = []
-        
-        # Add current message timestamp
-        self.user_message_counts[user_id].append(now)
-        
-        # Remove old timestamps (older than 1 minute)
-        self.user_message_counts[user_id] = [
-            timestamp for timestamp in self.user_message_counts[user_id]
-            if now - timestamp < timedelta(minutes=1)
-        ]
+        guild_id = message.guild.id if message.guild else None
+        key = (guild_id, message.author.id)
+        limit, window = BotConfig.SPAM_GUILD_LIMITS.get(
+            guild_id, (BotConfig.SPAM_THRESHOLD, BotConfig.SPAM_WINDOW)
+        )
         
-        # Check if user exceeded spam threshold
-        if len(self.user_message_counts[user_id]) > BotConfig.SPAM_THRESHOLD:
+        # Check if user exceeded spam threshold in this guild
+        if not self.spam_limiter.try_acquire(key, limit, window):
             try:
                 # Timeout user for 5 minutes
-                timeout_until = now + timedelta(minutes=5)
+                timeout_until = datetime.now() + timedelta(minutes=5)
                 await message.author.timeout(timeout_until, reason="Spam detection")
                 
                 embed = discord.Embed(
@@ -89,7 +88,7 @@ class ModerationCog(commands.Cog):
                 self.logger.info(f"Timed out {message.author} for spam in {message.guild.name}")
                 
                 # Reset user's message count
-                self.user_message_counts[user_id] = []
+                self.spam_limiter.reset(key)
                 
             except discord.Forbidden:
                 self.logger.warning(f"Cannot timeout {message.author} - insufficient permissions")
@@ -0,0 +1,159 @@
+import aiohttp
+import json
+import logging
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from config import BotConfig
+
+class OpenRouterError(Exception):
+    """Raised when OpenRouter returns a non-success response"""
+
+    def __init__(self, status: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"OpenRouter API error {status}: {body}")
+        self.status = status
+        self.body = body
+        self.retry_after = retry_after
+
+    @classmethod
+    async def from_response(cls, response: aiohttp.ClientResponse) -> 'OpenRouterError':
+        """Build an error from a failed HTTP response, keeping any Retry-After hint"""
+        retry_after = None
+        try:
+            retry_after = float(response.headers.get('Retry-After', ''))
+        except ValueError:
+            pass
+        return cls(response.status, await response.text(), retry_after)
+
+class OpenRouterClient:
+    """Shared OpenRouter client with a long-lived, keep-alive connection pool"""
+
+    def __init__(self):
+        self.logger = logging.getLogger('openrouter')
+        self.base_url = BotConfig.OPENROUTER_BASE_URL.rstrip('/')
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Open the pooled HTTP session"""
+        if self.session and not self.session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit=BotConfig.OPENROUTER_MAX_CONNECTIONS,
+            limit_per_host=BotConfig.OPENROUTER_MAX_CONNECTIONS,
+            keepalive_timeout=BotConfig.OPENROUTER_KEEPALIVE,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=BotConfig.OPENROUTER_TIMEOUT,
+            connect=BotConfig.OPENROUTER_CONNECT_TIMEOUT
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={
+                "Authorization": f"Bearer {BotConfig.OPENROUTER_API_KEY}",
+                "Content-Type": "application/json"
+            }
+        )
+        self.logger.info(
+            f"OpenRouter client started (max connections: {BotConfig.OPENROUTER_MAX_CONNECTIONS})"
+        )
+
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.logger.info("OpenRouter client closed")
+        self.session = None
+
+    def _build_payload(self, messages: List[Dict[str, str]], model: Optional[str],
+                       max_tokens: Optional[int], temperature: float,
+                       stop: Optional[List[str]] = None) -> dict:
+        """Build the chat completion request body"""
+        payload = {
+            "model": model or BotConfig.OPENROUTER_MODEL,
+            "messages": messages,
+            "max_tokens": max_tokens or BotConfig.MAX_TOKENS,
+            "temperature": temperature
+        }
+        if stop:
+            payload["stop"] = stop
+        return payload
+
+    async def chat_completion(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                              max_tokens: Optional[int] = None, temperature: float = 0.7,
+                              stop: Optional[List[str]] = None,
+                              on_usage: Optional[Callable[[dict], None]] = None) -> dict:
+        """Send a chat completion request and return the decoded response body
+
+        on_usage is called with the response's token usage block, if it has one.
+        """
+        if not self.session or self.session.closed:
+            await self.start()
+
+        payload = self._build_payload(messages, model, max_tokens, temperature, stop)
+
+        async with self.session.post(f"{self.base_url}/chat/completions", json=payload) as response:
+            if response.status != 200:
+                raise await OpenRouterError.from_response(response)
+            data = await response.json()
+        if on_usage and data.get("usage"):
+            on_usage(data["usage"])
+        return data
+
+    async def stream_chat_completion(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                                     max_tokens: Optional[int] = None,
+                                     temperature: float = 0.7,
+                                     stop: Optional[List[str]] = None,
+                                     on_usage: Optional[Callable[[dict], None]] = None) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding content deltas as they arrive
+
+        on_usage is called with the token usage block sent in the final chunk.
+        """
+        if not self.session or self.session.closed:
+            await self.start()
+
+        payload = self._build_payload(messages, model, max_tokens, temperature, stop)
+        payload["stream"] = True
+        if on_usage:
+            # Ask OpenRouter to report token usage at the end of the stream
+            payload["usage"] = {"include": True}
+
+        # A total timeout would cut long answers off mid-stream, so only give up
+        # when the stream goes quiet; AI_REQUEST_TIMEOUT bounds the whole answer
+        timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=BotConfig.OPENROUTER_CONNECT_TIMEOUT,
+            sock_read=BotConfig.OPENROUTER_STREAM_IDLE_TIMEOUT
+        )
+
+        async with self.session.post(f"{self.base_url}/chat/completions", json=payload,
+                                     timeout=timeout) as response:
+            if response.status != 200:
+                raise await OpenRouterError.from_response(response)
+
+            # Server-sent events: one "data: {...}" line per chunk, ":" lines are keep-alive comments
+            async for raw_line in response.content:
+                line = raw_line.decode('utf-8').strip()
+                if not line.startswith('data:'):
+                    continue
+
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    break
+
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+
+                if "error" in chunk:
+                    raise OpenRouterError(response.status, json.dumps(chunk["error"]))
+
+                if on_usage and chunk.get("usage"):
+                    on_usage(chunk["usage"])
+
+                choices = chunk.get("choices") or [{}]
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
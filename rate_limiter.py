@@ -0,0 +1,141 @@
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class TokenBucketLimiter:
+    """Memory-bounded token bucket rate limiter
+
+    Buckets are keyed by any hashable (user id, guild id, channel id or a tuple)
+    and refilled lazily on access. Each bucket is a (tokens, monotonic timestamp)
+    pair of floats. A bucket that has been idle long enough to refill completely
+    is indistinguishable from a missing one, so a periodic sweep drops it.
+    """
+
+    def __init__(self, rate: float, capacity: float, sweep_interval: float = 60.0):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.sweep_interval = sweep_interval
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def _refill(self, key: Hashable, now: float) -> float:
+        """Return the current token count for key"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.capacity
+        tokens, stamp = bucket
+        return min(self.capacity, tokens + (now - stamp) * self.rate)
+
+    def try_acquire(self, key: Hashable, cost: float = 1.0) -> bool:
+        """Take cost tokens from key's bucket, returning False if there are not enough"""
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        tokens = self._refill(key, now)
+        if tokens < cost:
+            return False
+
+        self._buckets[key] = (tokens - cost, now)
+        return True
+
+    def retry_after(self, key: Hashable, cost: float = 1.0) -> float:
+        """Seconds until key has enough tokens for cost"""
+        missing = cost - self._refill(key, time.monotonic())
+        return max(0.0, missing / self.rate) if self.rate else float('inf')
+
+    def reset(self, key: Hashable):
+        """Restore key's bucket to full"""
+        self._buckets.pop(key, None)
+
+    def sweep(self, now: float = None) -> int:
+        """Evict buckets that have refilled completely, returning how many were dropped"""
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+
+        idle = [
+            key for key, (tokens, stamp) in self._buckets.items()
+            if tokens + (now - stamp) * self.rate >= self.capacity
+        ]
+        for key in idle:
+            del self._buckets[key]
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+class _Window:
+    """Ring buffer of one key's latest event times"""
+    __slots__ = ('stamps', 'head', 'window')
+
+    def __init__(self, limit: int, window: float):
+        self.stamps: List[float] = [float('-inf')] * limit
+        self.head = 0  # index of the oldest stamp, where the next one goes
+        self.window = window
+
+class SlidingWindowLimiter:
+    """Memory-bounded sliding window rate limiter
+
+    Allows at most limit events per window seconds for each key (any
+    hashable, e.g. a (guild id, user id) tuple). Each key keeps the monotonic
+    times of its last limit events in a fixed-size ring buffer, so an event is
+    admitted in O(1) by comparing with the oldest of them. Keys whose events
+    have all left the window are indistinguishable from missing ones, so a
+    periodic sweep drops them. limit and window can be overridden per call,
+    e.g. per guild; a limit of 0 disables limiting.
+    """
+
+    def __init__(self, limit: int, window: float, sweep_interval: float = 60.0):
+        self.limit = limit
+        self.window = window  # seconds
+        self.sweep_interval = sweep_interval
+        self._windows: Dict[Hashable, _Window] = {}
+        self._last_sweep = time.monotonic()
+
+    def try_acquire(self, key: Hashable, limit: Optional[int] = None, window: Optional[float] = None) -> bool:
+        """Record an event for key, returning False if it already had limit events in the window"""
+        limit = self.limit if limit is None else limit
+        window = self.window if window is None else window
+        if limit <= 0:
+            return True
+        now = time.monotonic()
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep(now)
+
+        entry = self._windows.get(key)
+        if entry is None or len(entry.stamps) != limit:
+            entry = _Window(limit, window)
+            self._windows[key] = entry
+        entry.window = window
+
+        if now - entry.stamps[entry.head] < window:
+            return False
+        entry.stamps[entry.head] = now
+        entry.head = (entry.head + 1) % limit
+        return True
+
+    def retry_after(self, key: Hashable) -> float:
+        """Seconds until key may have another event"""
+        entry = self._windows.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, entry.stamps[entry.head] + entry.window - time.monotonic())
+
+    def reset(self, key: Hashable):
+        """Forget key's events"""
+        self._windows.pop(key, None)
+
+    def sweep(self, now: float = None) -> int:
+        """Evict keys whose events have all left the window, returning how many were dropped"""
+        now = time.monotonic() if now is None else now
+        self._last_sweep = now
+
+        idle = [
+            key for key, entry in self._windows.items()
+            if now - entry.stamps[entry.head - 1] >= entry.window
+        ]
+        for key in idle:
+            del self._windows[key]
+        return len(idle)
+
+    def __len__(self) -> int:
+        return len(self._windows)
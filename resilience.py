@@ -0,0 +1,213 @@
+import aiohttp
+import asyncio
+import logging
+import random
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+from config import BotConfig
+from utils.openrouter import OpenRouterClient, OpenRouterError
+from utils.ai_health import AIHealthMonitor
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed request is worth retrying or falling back on"""
+    if isinstance(error, OpenRouterError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+class CircuitBreaker:
+    """Per-model circuit breaker
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail fast. Once reset_timeout has passed a single trial call is let
+    through; its outcome closes or re-opens the circuit. hold_open() opens it
+    for a given time instead, e.g. until a rate limit's Retry-After expires.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.retry_at = 0.0  # monotonic time an open circuit lets a trial call through
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now"""
+        if self.state == self.CLOSED:
+            return True
+        if time.monotonic() < self.retry_at:
+            return False
+        # Let one trial call through; restart the clock in case it never reports back
+        self.state = self.HALF_OPEN
+        self.retry_at = time.monotonic() + self.reset_timeout
+        return True
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently failing fast"""
+        return self.state == self.OPEN and time.monotonic() < self.retry_at
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit past the threshold"""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.retry_at = time.monotonic() + self.reset_timeout
+
+    def hold_open(self, seconds: float):
+        """Fail calls fast for at least the next seconds"""
+        self.state = self.OPEN
+        self.retry_at = max(self.retry_at, time.monotonic() + seconds)
+
+class ResilientOpenRouterClient:
+    """OpenRouter client wrapper with retries, circuit breakers and model fallback
+
+    Retryable failures (429, 5xx, network errors) are retried with jittered
+    exponential backoff, honoring Retry-After. When a model keeps failing or
+    its circuit is open, the next model in the fallback chain is tried. A model
+    asking to be left alone for longer than AI_RETRY_MAX_DELAY is skipped
+    straight away, and its circuit is held open until Retry-After expires.
+    """
+
+    def __init__(self, client: OpenRouterClient, health: Optional[AIHealthMonitor] = None):
+        self.client = client
+        self.health = health
+        self.logger = logging.getLogger('openrouter')
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def model_chain(self, primary: Optional[str] = None) -> List[str]:
+        """Primary model followed by the configured fallbacks, without duplicates
+
+        Models the health monitor reports as unhealthy are moved to the end.
+        """
+        chain = [primary or BotConfig.OPENROUTER_MODEL, *BotConfig.OPENROUTER_FALLBACK_MODELS]
+        chain = list(dict.fromkeys(chain))
+        if self.health:
+            chain.sort(key=lambda model: not self.health.is_healthy(model))
+        return chain
+
+    def _record(self, model: str, started: float, error: Optional[Exception] = None):
+        """Report an attempt's outcome to the health monitor"""
+        if self.health:
+            self.health.record(model, time.monotonic() - started, error is None, str(error)[:200] if error else None)
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        """Circuit breaker for a model"""
+        if model not in self.breakers:
+            self.breakers[model] = CircuitBreaker(
+                BotConfig.AI_BREAKER_THRESHOLD, BotConfig.AI_BREAKER_RESET
+            )
+        return self.breakers[model]
+
+    def available(self) -> bool:
+        """Whether any model in the chain would accept a call right now"""
+        return any(not self.breaker(model).is_open for model in self.model_chain())
+
+    def _throttled(self, model: str, error: Exception) -> bool:
+        """Hold a model's circuit open if error asks for a longer wait than is worth retrying
+
+        Returns True when the caller should move on to the next model.
+        """
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is None or retry_after <= BotConfig.AI_RETRY_MAX_DELAY:
+            return False
+        self.breaker(model).hold_open(retry_after)
+        self.logger.warning(f"{model} is rate limited for {retry_after:.0f}s, falling back")
+        return True
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Delay before the next attempt, using Retry-After when the server sent one"""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return retry_after
+        delay = min(BotConfig.AI_RETRY_MAX_DELAY, BotConfig.AI_RETRY_BASE_DELAY * 2 ** attempt)
+        return random.uniform(0, delay)
+
+    async def chat_completion(self, messages, model: Optional[str] = None, **kwargs) -> dict:
+        """Chat completion with retries and fallback across the model chain"""
+        last_error: Exception = OpenRouterError(503, "All models are unavailable (circuits open)")
+
+        for candidate in self.model_chain(model):
+            breaker = self.breaker(candidate)
+            if not breaker.allow():
+                continue
+
+            for attempt in range(BotConfig.AI_MAX_RETRIES + 1):
+                started = time.monotonic()
+                try:
+                    data = await self.client.chat_completion(messages, model=candidate, **kwargs)
+                except Exception as e:
+                    if not is_retryable(e):
+                        raise
+                    self._record(candidate, started, e)
+                    last_error = e
+                    self.logger.warning(f"{candidate} attempt {attempt + 1} failed: {e}")
+                    if self._throttled(candidate, e):
+                        break
+                    if attempt < BotConfig.AI_MAX_RETRIES:
+                        await asyncio.sleep(self._backoff(attempt, e))
+                    continue
+
+                self._record(candidate, started)
+                breaker.record_success()
+                return data
+            else:
+                breaker.record_failure()
+                self.logger.warning(f"Falling back from {candidate} after {BotConfig.AI_MAX_RETRIES + 1} attempts")
+
+        raise last_error
+
+    async def stream_chat_completion(self, messages, model: Optional[str] = None,
+                                     **kwargs) -> AsyncIterator[str]:
+        """Streamed chat completion with retries and fallback until the first token arrives
+
+        Once text has been yielded a failure is raised as-is, since the caller
+        has already shown part of the answer.
+        """
+        last_error: Exception = OpenRouterError(503, "All models are unavailable (circuits open)")
+
+        for candidate in self.model_chain(model):
+            breaker = self.breaker(candidate)
+            if not breaker.allow():
+                continue
+
+            for attempt in range(BotConfig.AI_MAX_RETRIES + 1):
+                started = False
+                attempt_started = time.monotonic()
+                try:
+                    async for delta in self.client.stream_chat_completion(messages, model=candidate, **kwargs):
+                        if not started:
+                            # Health latency for streams is time to first token
+                            self._record(candidate, attempt_started)
+                        started = True
+                        yield delta
+                except Exception as e:
+                    if started or not is_retryable(e):
+                        if is_retryable(e):
+                            breaker.record_failure()
+                        raise
+                    self._record(candidate, attempt_started, e)
+                    last_error = e
+                    self.logger.warning(f"{candidate} stream attempt {attempt + 1} failed: {e}")
+                    if self._throttled(candidate, e):
+                        break
+                    if attempt < BotConfig.AI_MAX_RETRIES:
+                        await asyncio.sleep(self._backoff(attempt, e))
+                    continue
+
+                breaker.record_success()
+                return
+            else:
+                breaker.record_failure()
+                self.logger.warning(f"Falling back from {candidate} after {BotConfig.AI_MAX_RETRIES + 1} attempts")
+
+        raise last_error
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one in-flight task
+
+    The shared task is cancelled once every caller waiting on it has been
+    cancelled, so abandoned work does not keep running.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """Await the in-flight task for key, starting it with factory if there is none"""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            # Shield so one caller giving up does not cancel the call for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1 and not task.done():
+                task.cancel()
+                # New callers must start fresh rather than join the cancelled task
+                self._forget(key, task)
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+
+    def _forget(self, key: str, task: asyncio.Task):
+        """Drop key's in-flight entry if it still refers to task"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
@@ -0,0 +1,56 @@
+import re
+from typing import List
+
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?。！？])\s+|\n{2,}')
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation and blank lines"""
+    return [sentence.strip() for sentence in SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """Group whole sentences into chunks of at most max_chars characters
+
+    Sentences longer than max_chars are split on whitespace, or hard-cut
+    if they contain none.
+    """
+    chunks = []
+    current = []
+    current_len = 0
+
+    for sentence in split_sentences(text):
+        pieces = [sentence] if len(sentence) <= max_chars else _split_long(sentence, max_chars)
+        for piece in pieces:
+            added = len(piece) + (1 if current else 0)
+            if current and current_len + added > max_chars:
+                chunks.append(' '.join(current))
+                current = []
+                current_len = 0
+                added = len(piece)
+            current.append(piece)
+            current_len += added
+
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Break an oversized sentence into pieces of at most max_chars"""
+    pieces = []
+    current = ''
+    for word in sentence.split():
+        while len(word) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if not word:
+            continue
+        if current and len(current) + 1 + len(word) > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
@@ -0,0 +1,181 @@
+import re
+import string
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# Look-alike digits and symbols, folded to the letter they stand for inside
+# words that also contain a letter ("sh!t", "a55"). Elsewhere digits are left
+# alone so plain numbers ("455", "4.55") stay numbers, and the symbols are dropped.
+LEETSPEAK = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '9': 'g',
+    '@': 'a', '$': 's', '!': 'i', '|': 'i', '+': 't', '€': 'e',
+}
+
+# Cyrillic and Greek letters that render like Latin ones (lowercase, since
+# text is casefolded first). Fullwidth, circled, mathematical and other
+# compatibility forms are already folded by NFKD.
+CONFUSABLES = {
+    'а': 'a', 'в': 'b', 'е': 'e', 'з': '3', 'і': 'i', 'ј': 'j', 'к': 'k', 'м': 'm', 'н': 'h',
+    'о': 'o', 'п': 'n', 'р': 'p', 'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's', 'ь': 'b',
+    'ԁ': 'd', 'һ': 'h', 'ԛ': 'q', 'ԝ': 'w',
+    'α': 'a', 'β': 'b', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'μ': 'u', 'ν': 'v', 'ο': 'o',
+    'ρ': 'p', 'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w',
+}
+
+# Characters that render as nothing: zero-width spaces and joiners, bidi
+# controls, variation selectors, fillers
+INVISIBLE_RANGES = [
+    (0x00AD, 0x00AD), (0x061C, 0x061C), (0x115F, 0x1160), (0x17B4, 0x17B5), (0x180B, 0x180E),
+    (0x200B, 0x200F), (0x202A, 0x202E), (0x2060, 0x206F), (0x3164, 0x3164), (0xFE00, 0xFE0F),
+    (0xFEFF, 0xFEFF), (0xFFA0, 0xFFA0), (0xE0000, 0xE007F),
+]
+
+# Combining marks left over once NFKD has split accents off their letters
+COMBINING_RANGES = [
+    (0x0300, 0x036F), (0x1AB0, 0x1AFF), (0x1DC0, 0x1DFF), (0x20D0, 0x20FF), (0xFE20, 0xFE2F),
+]
+
+# User, role and channel mentions and custom emoji, whose ids would fold into letters
+DISCORD_MARKUP = re.compile(r'<(?:@[!&]?|#|a?:\w*:)\d+>')
+
+# A word containing a leetspeak character (only tried from the start of a
+# word), and a letter to tell it from a number
+LEET_CHAR = re.compile('[' + re.escape(''.join(LEETSPEAK)) + ']')
+LEET_WORD = re.compile(r'(?<![^ ])[^ ]*' + LEET_CHAR.pattern + '[^ ]*')
+LETTER = re.compile(r'[^\W\d_]')
+
+# Links keep their digits; folded text has lost the "://"
+LINK_PREFIXES = ('http', 'www')
+
+# Three or more single characters separated by spaces, as in "b a d". Matched
+# in the text with a space prepended, so every run starts with a literal space.
+SPACED_LETTERS = re.compile(r' \w(?: +\w\b){2,}')
+
+def _build_fold_table() -> Dict[int, Optional[str]]:
+    """The str.translate table applied after NFKD and casefolding"""
+    table: Dict[int, Optional[str]] = {}
+    # Every kind of whitespace becomes a plain space
+    for code in range(0x3001):
+        if chr(code).isspace():
+            table[code] = ' '
+    # Separators inside a word ("b.a.d", "b_a_d") are dropped; leetspeak
+    # symbols are kept until it is known whether they stand for letters
+    for char in string.punctuation:
+        if char not in LEETSPEAK:
+            table[ord(char)] = None
+    for start, end in INVISIBLE_RANGES + COMBINING_RANGES:
+        for code in range(start, end + 1):
+            table[code] = None
+    for char, replacement in CONFUSABLES.items():
+        table[ord(char)] = replacement
+    return table
+
+FOLD_TABLE = _build_fold_table()
+
+# Leetspeak in a word with letters, and in one without (a number, a link)
+LEET_TABLE = str.maketrans(LEETSPEAK)
+NUMBER_TABLE = str.maketrans({char: None for char in LEETSPEAK if not char.isdigit()})
+
+# The ASCII part of FOLD_TABLE for bytes.translate, which is much faster than str.translate
+ASCII_TABLE = bytes(
+    ord(FOLD_TABLE.get(code, chr(code)) or '\0') for code in range(128)
+) + bytes(range(128, 256))
+ASCII_DELETE = bytes(code for code in range(128) if code in FOLD_TABLE and FOLD_TABLE[code] is None)
+
+def _fold(text: str) -> str:
+    """NFKD, casefold and translate text"""
+    if text.isascii():
+        return text.lower().encode('ascii').translate(ASCII_TABLE, ASCII_DELETE).decode('ascii')
+    return unicodedata.normalize('NFKD', text).casefold().translate(FOLD_TABLE)
+
+def _join_spaced(text: str) -> str:
+    """Join runs of spaced-out single letters"""
+    return SPACED_LETTERS.sub(lambda run: ' ' + run.group().replace(' ', ''), ' ' + text)[1:]
+
+def _leet_table(word: str) -> dict:
+    """How the leetspeak characters of a word are folded"""
+    if LETTER.search(word) and not word.startswith(LINK_PREFIXES):
+        return LEET_TABLE
+    return NUMBER_TABLE
+
+def _unleet(text: str) -> str:
+    """Fold leetspeak in words that have letters, and drop its symbols elsewhere"""
+    if not LEET_CHAR.search(text):
+        return text
+    return LEET_WORD.sub(lambda word: word.group().translate(_leet_table(word.group())), text)
+
+def normalize(text: str) -> str:
+    """Fold text into the form filtered words are matched in
+
+    Discord markup is blanked, compatibility forms and accents are folded by
+    NFKD, case by casefold, and confusables, invisible characters and in-word
+    punctuation by a single str.translate table. Runs of spaced-out single
+    letters are then joined up, and leetspeak is folded in words that contain
+    a letter. ASCII text skips NFKD and is translated as bytes, so the common
+    case costs a few C-level passes.
+    """
+    if '<' in text:
+        text = DISCORD_MARKUP.sub(' ', text)
+    return _unleet(_join_spaced(_fold(text)))
+
+def normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """normalize(text) along with, for each of its characters, the index in text it came from
+
+    Folds one character at a time, so it is several times slower than
+    normalize(); use it to report where a match found in normalize()'s
+    output sits in the original text.
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+
+    def fold_range(start: int, end: int):
+        for index in range(start, end):
+            for char in _fold(text[index]):
+                chars.append(char)
+                offsets.append(index)
+
+    position = 0
+    if '<' in text:
+        for markup in DISCORD_MARKUP.finditer(text):
+            fold_range(position, markup.start())
+            chars.append(' ')
+            offsets.append(markup.start())
+            position = markup.end()
+    fold_range(position, len(text))
+
+    folded = ''.join(chars)
+    kept = []
+    position = 0
+    # Same runs as _join_spaced; with the prepended space, run.start() is the
+    # index in folded of the run's first letter
+    for run in SPACED_LETTERS.finditer(' ' + folded):
+        start, end = run.start(), run.end() - 1
+        kept.extend(range(position, start + 1))
+        kept.extend(index for index in range(start + 1, end) if folded[index] != ' ')
+        position = end
+    if kept or position:
+        kept.extend(range(position, len(folded)))
+        folded, offsets = ''.join(folded[index] for index in kept), [offsets[index] for index in kept]
+
+    # Same words as _unleet, translated one character at a time
+    chars, kept_offsets = [], []
+    position = 0
+    for word in LEET_WORD.finditer(folded):
+        chars.append(folded[position:word.start()])
+        kept_offsets.extend(offsets[position:word.start()])
+        table = _leet_table(word.group())
+        for index in range(word.start(), word.end()):
+            char = folded[index].translate(table)
+            if char:
+                chars.append(char)
+                kept_offsets.append(offsets[index])
+        position = word.end()
+    if not position:
+        return folded, offsets
+    chars.append(folded[position:])
+    kept_offsets.extend(offsets[position:])
+    return ''.join(chars), kept_offsets
+
+def original_span(offsets: List[int], start: int, end: int) -> Tuple[int, int]:
+    """Map a [start, end) span of normalized text back onto the original text"""
+    return offsets[start], offsets[end - 1] + 1
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import BotConfig
+
+class UsageMeter:
+    """Per-guild and per-user AI token accounting with daily quotas
+
+    Usage is aggregated in memory per (UTC day, guild, user) and flushed to a
+    SQLite file every flush_interval seconds. Today's totals are kept in
+    memory, seeded from the database on start, so quota checks never touch
+    the disk. Direct messages are accounted under guild id 0.
+    """
+
+    def __init__(self, path: str, flush_interval: float):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger('usage')
+        # (day, guild id, user id) -> [prompt tokens, completion tokens, requests] not yet flushed
+        self._pending: Dict[Tuple[str, int, int], List[int]] = defaultdict(lambda: [0, 0, 0])
+        self._day = self.today()
+        self._guild_today: Dict[int, int] = defaultdict(int)
+        self._user_today: Dict[int, int] = defaultdict(int)
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def today() -> str:
+        """Current UTC date, the unit quotas reset on"""
+        return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+    def _roll_day(self):
+        """Reset today's totals once the UTC date changes"""
+        day = self.today()
+        if day != self._day:
+            self._day = day
+            self._guild_today.clear()
+            self._user_today.clear()
+
+    def record(self, guild_id: Optional[int], user_id: Optional[int], prompt_tokens: int, completion_tokens: int):
+        """Add one request's token usage"""
+        self._roll_day()
+        guild_id, user_id = guild_id or 0, user_id or 0
+        counters = self._pending[(self._day, guild_id, user_id)]
+        counters[0] += prompt_tokens
+        counters[1] += completion_tokens
+        counters[2] += 1
+        total = prompt_tokens + completion_tokens
+        self._guild_today[guild_id] += total
+        self._user_today[user_id] += total
+
+    def used_today(self, guild_id: Optional[int] = None, user_id: Optional[int] = None) -> int:
+        """Tokens a guild or user has used so far today"""
+        self._roll_day()
+        if user_id is not None:
+            return self._user_today.get(user_id, 0)
+        return self._guild_today.get(guild_id or 0, 0)
+
+    def total_today(self) -> int:
+        """Tokens used across all guilds so far today"""
+        self._roll_day()
+        return sum(self._guild_today.values())
+
+    def quota_exceeded(self, guild_id: Optional[int], user_id: Optional[int]) -> Optional[str]:
+        """'guild' or 'user' if that daily quota is used up, otherwise None"""
+        guild_quota = BotConfig.AI_GUILD_DAILY_TOKENS
+        if guild_quota and guild_id and self.used_today(guild_id=guild_id) >= guild_quota:
+            return 'guild'
+        user_quota = BotConfig.AI_USER_DAILY_TOKENS
+        if user_quota and user_id and self.used_today(user_id=user_id) >= user_quota:
+            return 'user'
+        return None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS ai_usage ("
+            "day TEXT NOT NULL, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+            "prompt_tokens INTEGER NOT NULL, completion_tokens INTEGER NOT NULL, requests INTEGER NOT NULL, "
+            "PRIMARY KEY (day, guild_id, user_id))"
+        )
+        return connection
+
+    def _load_today(self):
+        """Seed today's in-memory totals from the database"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT guild_id, user_id, prompt_tokens + completion_tokens FROM ai_usage WHERE day = ?",
+                (self._day,)
+            ).fetchall()
+        for guild_id, user_id, total in rows:
+            self._guild_today[guild_id] += total
+            self._user_today[user_id] += total
+
+    def _write(self, rows: List[Tuple[str, int, int, int, int, int]]):
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO ai_usage (day, guild_id, user_id, prompt_tokens, completion_tokens, requests) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (day, guild_id, user_id) DO UPDATE SET "
+                "prompt_tokens = prompt_tokens + excluded.prompt_tokens, "
+                "completion_tokens = completion_tokens + excluded.completion_tokens, "
+                "requests = requests + excluded.requests",
+                rows
+            )
+
+    async def flush(self):
+        """Write pending counters to the database"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, defaultdict(lambda: [0, 0, 0])
+        rows = [(day, guild_id, user_id, *counters) for (day, guild_id, user_id), counters in pending.items()]
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to flush AI usage: {e}")
+            # Keep the counters for the next flush
+            for key, counters in pending.items():
+                merged = self._pending[key]
+                for i, value in enumerate(counters):
+                    merged[i] += value
+
+    def _query_top(self, column: str, since: str, guild_id: Optional[int], limit: int) -> List[Tuple[int, int, int]]:
+        where, params = "day >= ?", [since]
+        if guild_id is not None:
+            where += " AND guild_id = ?"
+            params.append(guild_id)
+        with self._connect() as connection:
+            return connection.execute(
+                f"SELECT {column}, SUM(prompt_tokens + completion_tokens) AS tokens, SUM(requests) "
+                f"FROM ai_usage WHERE {where} GROUP BY {column} ORDER BY tokens DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+
+    async def top_consumers(self, by: str = 'guild', since: Optional[str] = None, guild_id: Optional[int] = None,
+                            limit: int = 10) -> List[Tuple[int, int, int]]:
+        """(id, tokens, requests) of the heaviest guilds or users since a UTC day, today by default
+
+        With guild_id only usage inside that guild is counted.
+        """
+        column = 'user_id' if by == 'user' else 'guild_id'
+        await self.flush()
+        return await asyncio.to_thread(self._query_top, column, since or self.today(), guild_id, limit)
+
+    async def _run(self):
+        """Flush loop"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        """Load today's totals and start flushing in the background"""
+        try:
+            await asyncio.to_thread(self._load_today)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to load AI usage: {e}")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"AI usage meter started (flushing every {self.flush_interval}s to {self.path})")
+
+    async def stop(self):
+        """Stop the flush loop and write what is left"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()